@@ -0,0 +1,294 @@
+# ======================================================
+# Archivo: Generador_Ejercicios.py
+# Hojas de práctica para los módulos de complejos y de división de polinomios
+# (sections/02-13 y sections/20). Cada tipo de ejercicio se sortea en lote con
+# NumPy y se construye "al revés" para que la respuesta sea bonita: la división
+# de complejos parte del cociente entero de Gauss y la de polinomios del
+# cociente y residuo enteros. Los repetidos se descartan con un índice hash
+# global, así que ningún ejercicio se repite en todas las hojas del lote.
+# La salida usa ejercicio/\muestraSolucion de macros.sty: un documento
+# [nosolucion] y otro [solucion] con las mismas hojas.
+#
+# Uso: python Generador_Ejercicios.py [--hojas 30] [--semilla 2025] [--salida hojas_practica]
+# Compilar (desde hojas_practica/; macros.sty vive en la carpeta padre, como en
+# examenes/Makefile):  TEXINPUTS=.:..: latexmk -pdf hojas_sin.tex hojas_con.tex
+# ======================================================
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+TIPOS = ("suma", "resta", "multiplicacion", "division", "polinomios")
+POR_HOJA = {"suma": 2, "resta": 2, "multiplicacion": 3, "division": 3, "polinomios": 4}
+MAX_ABS = 9                 # |parte real| e |imaginaria| de los operandos
+MAX_COEF = 6                # |coeficientes| de cociente, divisor y residuo
+
+
+# ----------------------------------------
+# ÍNDICE HASH
+# ----------------------------------------
+class IndiceEjercicios:
+    """Hashes de 64 bits de (tipo, fila de datos) ya emitidos, en un arreglo ordenado.
+
+    nuevos() marca, en una sola pasada vectorizada, las filas que no se habían
+    visto (ni antes ni dentro del mismo lote) y las agrega al índice.
+    """
+
+    def __init__(self):
+        self.vistos = np.zeros(0, dtype=np.uint64)
+
+    @staticmethod
+    def hashes(tipo, filas):
+        filas = np.ascontiguousarray(filas, dtype=np.int64)
+        pesos = np.random.default_rng(TIPOS.index(tipo)).integers(1, 2**63, size=filas.shape[1], dtype=np.uint64) | 1
+        with np.errstate(over="ignore"):
+            h = (filas.astype(np.uint64) * pesos).sum(axis=1, dtype=np.uint64)
+            return h ^ (h >> np.uint64(29))
+
+    def nuevos(self, tipo, filas):
+        h = self.hashes(tipo, filas)
+        _, primeros = np.unique(h, return_index=True)
+        mascara = np.zeros(len(h), dtype=bool)
+        mascara[primeros] = True
+        mascara &= ~np.isin(h, self.vistos)
+        self.vistos = np.union1d(self.vistos, h[mascara])
+        return mascara
+
+
+# ----------------------------------------
+# ENTEROS DE GAUSS (filas [re, im, ...])
+# ----------------------------------------
+def _complejos(n, max_abs, rng, no_nulos=True):
+    z = rng.integers(-max_abs, max_abs + 1, size=(n, 2))
+    if no_nulos:
+        z[(z == 0).all(axis=1), 0] = 1
+    return z
+
+def multiplicar_complejos(z, w):
+    a, b, c, d = z[:, 0], z[:, 1], w[:, 0], w[:, 1]
+    return np.stack([a*c - b*d, a*d + b*c], axis=1)
+
+def _sorteo_complejos(tipo, n, max_abs, rng):
+    """Filas [z1 | z2 | respuesta] (división: [numerador | divisor | cociente])."""
+    if tipo == "division":
+        q = _complejos(n, max_abs, rng)
+        d = _complejos(n, max_abs, rng)
+        d = d[(d * d).sum(axis=1) >= 2]           # sin dividir entre ±1, ±i
+        q = q[:len(d)]
+        return np.concatenate([multiplicar_complejos(q, d), d, q], axis=1)
+    z, w = _complejos(n, max_abs, rng), _complejos(n, max_abs, rng)
+    r = {"suma": z + w, "resta": z - w, "multiplicacion": multiplicar_complejos(z, w)}[tipo]
+    return np.concatenate([z, w, r], axis=1)
+
+
+# ----------------------------------------
+# POLINOMIOS (coeficientes de mayor a menor grado)
+# ----------------------------------------
+def multiplicar_polinomios(p, q):
+    """Producto de N pares de polinomios a la vez: (N, a) * (N, b) -> (N, a + b - 1)."""
+    out = np.zeros((len(p), p.shape[1] + q.shape[1] - 1), dtype=np.int64)
+    for j in range(q.shape[1]):
+        out[:, j:j + p.shape[1]] += p * q[:, j:j + 1]
+    return out
+
+def dividir_polinomios(num, div):
+    """División larga de N pares a la vez; exige que cada paso sea exacto en enteros."""
+    resto = num.astype(np.int64).copy()
+    grado_q = num.shape[1] - div.shape[1]
+    lider = div[:, :1]
+    q = np.zeros((len(num), grado_q + 1), dtype=np.int64)
+    for k in range(grado_q + 1):
+        if (resto[:, k:k + 1] % lider != 0).any():
+            raise ValueError("El cociente no es entero.")
+        q[:, k] = resto[:, k] // lider[:, 0]
+        resto[:, k:k + div.shape[1]] -= q[:, k:k + 1] * div
+    return q, resto[:, grado_q + 1:]
+
+def _sorteo_polinomios(n, rng, grado_q, grado_d, max_coef=MAX_COEF, max_lider=2):
+    """Filas [numerador | divisor | cociente | residuo] con num = q·d + r y grado r < grado d."""
+    q = rng.integers(-max_coef, max_coef + 1, size=(n, grado_q + 1))
+    q[:, 0] = rng.choice([-3, -2, -1, 1, 2, 3], size=n)
+    d = rng.integers(-max_coef, max_coef + 1, size=(n, grado_d + 1))
+    d[:, 0] = rng.integers(1, max_lider + 1, size=n)
+    r = rng.integers(-max_coef, max_coef + 1, size=(n, grado_d))
+    r[rng.random(n) < 0.4] = 0                  # parte de los ejercicios sin residuo
+    num = multiplicar_polinomios(q, d)
+    num[:, -grado_d:] += r
+    return np.concatenate([num, d, q, r], axis=1)
+
+
+# ----------------------------------------
+# LOTES SIN REPETIDOS
+# ----------------------------------------
+def generar(tipo, cantidad, indice=None, rng=None, max_abs=MAX_ABS, grados=((1, 1), (2, 1), (3, 1), (2, 2), (3, 2))):
+    """`cantidad` ejercicios distintos de `tipo` como lista de filas enteras (y grados, en polinomios).
+
+    Se sortean lotes vectorizados y el índice hash descarta lo ya emitido hasta
+    completar. Las respuestas se verifican en aritmética entera exacta.
+    """
+    indice = IndiceEjercicios() if indice is None else indice
+    rng = np.random.default_rng() if rng is None else rng
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo desconocido: {tipo}. Use uno de {TIPOS}.")
+    elegidos, total = [], 0
+    for _ in range(50):
+        faltan = cantidad - total
+        if faltan <= 0:
+            break
+        extra = faltan + faltan // 4 + 8
+        if tipo == "polinomios":
+            for gq, gd in grados:
+                filas = _sorteo_polinomios(extra // len(grados) + 1, rng, gq, gd)
+                grado = np.broadcast_to([gq, gd], (len(filas), 2))
+                filas = filas[indice.nuevos(tipo, np.concatenate([grado, filas], axis=1))]
+                elegidos.extend((gq, gd, f) for f in filas)
+            total = len(elegidos)
+        else:
+            filas = _sorteo_complejos(tipo, extra, max_abs, rng)
+            filas = filas[indice.nuevos(tipo, filas)]
+            elegidos.append(filas)
+            total += len(filas)
+    if total < cantidad:
+        raise ValueError(f"Solo hay {total} ejercicios distintos de tipo {tipo}; se pidieron {cantidad}.")
+
+    if tipo != "polinomios":
+        filas = np.concatenate(elegidos)[:cantidad]
+        verificar_complejos(tipo, filas)
+        return list(filas)
+    orden = rng.permutation(len(elegidos))[:cantidad]
+    elegidos = [elegidos[k] for k in orden]
+    for gq, gd in grados:
+        filas = [f for a, b, f in elegidos if (a, b) == (gq, gd)]
+        if filas:
+            verificar_polinomios(np.array(filas), gq, gd)
+    return elegidos
+
+def verificar_complejos(tipo, filas):
+    z, w, r = filas[:, 0:2], filas[:, 2:4], filas[:, 4:6]
+    if tipo == "division":
+        ok = (multiplicar_complejos(r, w) == z).all()
+    else:
+        ok = ({"suma": z + w, "resta": z - w, "multiplicacion": multiplicar_complejos(z, w)}[tipo] == r).all()
+    if not ok:
+        raise ValueError(f"Alguna respuesta de {tipo} no es correcta.")
+
+def _partes_polinomio(filas, gq, gd):
+    cortes = np.cumsum([gq + gd + 1, gd + 1, gq + 1])
+    return np.split(filas, cortes, axis=1)
+
+def verificar_polinomios(filas, gq, gd):
+    num, d, q, r = _partes_polinomio(filas, gq, gd)
+    q2, r2 = dividir_polinomios(num, d)
+    if not ((q2 == q).all() and (r2 == r).all()):
+        raise ValueError("Algún cociente o residuo de polinomios no es correcto.")
+
+
+# ----------------------------------------
+# LaTeX
+# ----------------------------------------
+def _suma_tex(terminos):
+    """[(coeficiente, sufijo)] -> "3x^{2}-x+4" (omite ceros; "0" si no queda nada)."""
+    partes = []
+    for c, sufijo in terminos:
+        c = int(c)
+        if c == 0:
+            continue
+        cuerpo = sufijo if abs(c) == 1 and sufijo else f"{abs(c)}{sufijo}"
+        partes.append(("-" if c < 0 else ("+" if partes else "")) + cuerpo)
+    return "".join(partes) or "0"
+
+def _cuadrado(x):
+    return f"({x})^2" if x < 0 else f"{x}^2"
+
+def complejo_tex(a, b):
+    return _suma_tex([(a, ""), (b, "i")])
+
+def polinomio_tex(coefs):
+    g = len(coefs) - 1
+    return _suma_tex([(c, "" if k == g else ("x" if k == g - 1 else f"x^{{{g - k}}}"))
+                      for k, c in enumerate(coefs)])
+
+def tex_complejos(tipo, fila):
+    a, b, c, d, e, f = (int(x) for x in fila)
+    z, w, r = complejo_tex(a, b), complejo_tex(c, d), complejo_tex(e, f)
+    if tipo == "suma":
+        return rf"Calcule $({z}) + ({w})$.", f"${r}$"
+    if tipo == "resta":
+        return rf"Calcule $({z}) - ({w})$.", f"${r}$"
+    if tipo == "multiplicacion":
+        pasos = _suma_tex([(a*c, ""), (a*d, "i"), (b*c, "i"), (b*d, "i^2")])
+        return rf"Calcule $({z})({w})$.", f"${pasos} = {r}$"
+    norma = c*c + d*d
+    conj = complejo_tex(c, -d)
+    p = complejo_tex(e * norma, f * norma)
+    return (rf"Calcule $\displaystyle \frac{{{z}}}{{{w}}}$.",
+            rf"$\displaystyle \frac{{{z}}}{{{w}}} = \frac{{({z})({conj})}}{{{_cuadrado(c)}+{_cuadrado(d)}}} = \frac{{{p}}}{{{norma}}} = {r}.$")
+
+def tex_polinomios(gq, gd, fila):
+    num, d, q, r = _partes_polinomio(np.asarray(fila)[None, :], gq, gd)
+    enunciado = rf"Calcule $\dfrac{{{polinomio_tex(num[0])}}}{{{polinomio_tex(d[0])}}}$."
+    solucion = f"${polinomio_tex(q[0])}$"
+    if r.any():
+        solucion += f" con residuo ${polinomio_tex(r[0])}$"
+    return enunciado, solucion
+
+def ejercicio_tex(enunciado, solucion):
+    return f"\\begin{{ejercicio}}\n{enunciado}\n\\end{{ejercicio}}\n\\muestraSolucion{{{solucion}}}\n"
+
+
+# ----------------------------------------
+# HOJAS
+# ----------------------------------------
+def generar_hojas(cantidad, por_hoja=POR_HOJA, semilla=None):
+    """`cantidad` hojas; cada una es una lista de (enunciado, solución) sin repetidos en todo el lote."""
+    rng = np.random.default_rng(semilla)
+    indice = IndiceEjercicios()
+    hojas = [[] for _ in range(cantidad)]
+    for tipo, k in por_hoja.items():
+        lote = generar(tipo, cantidad * k, indice, rng)
+        for n, ej in enumerate(lote):
+            tex = tex_polinomios(*ej) if tipo == "polinomios" else tex_complejos(tipo, ej)
+            hojas[n // k].append(tex)
+    return hojas
+
+ENCABEZADO = r"""\documentclass[12pt,a4paper]{article}
+\usepackage[spanish,es-nodecimaldot]{babel}
+\usepackage[utf8]{inputenc}
+\usepackage[T1]{fontenc}
+\usepackage{lmodern}
+\usepackage[margin=2.5cm]{geometry}
+\usepackage{amsmath,amssymb}
+\usepackage[%s]{macros}
+\setupEncabezado{Hojas de práctica}{Complejos y división de polinomios}{Álgebra Lineal}
+\begin{document}
+"""
+
+def escribir_documento(ruta, hojas, solucion):
+    """Todas las hojas en un solo .tex (una compilación), numeración reiniciada por hoja."""
+    with open(ruta, "w", encoding="utf-8", buffering=1 << 16) as f:
+        f.write(ENCABEZADO % ("solucion" if solucion else "nosolucion"))
+        for n, hoja in enumerate(hojas, start=1):
+            f.write(f"\\section*{{Hoja {n}}}\n\\setcounter{{ctrEjercicio}}{{0}}\n")
+            f.writelines(ejercicio_tex(e, s) for e, s in hoja)
+            f.write("\\newpage\n")
+        f.write("\\end{document}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hojas de práctica de complejos y división de polinomios.")
+    parser.add_argument("--hojas", type=int, default=30)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--salida", default="hojas_practica", help="carpeta de hojas_sin.tex y hojas_con.tex")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    hojas = generar_hojas(args.hojas, semilla=args.semilla)
+    os.makedirs(args.salida, exist_ok=True)
+    escribir_documento(os.path.join(args.salida, "hojas_sin.tex"), hojas, solucion=False)
+    escribir_documento(os.path.join(args.salida, "hojas_con.tex"), hojas, solucion=True)
+    print(f"✅ {args.hojas} hojas ({sum(map(len, hojas))} ejercicios distintos) en {args.salida} "
+          f"({time.perf_counter() - inicio:.2f} s)")
+    print(f"   Compilar: cd {args.salida} && TEXINPUTS=.:{os.path.relpath(os.path.dirname(os.path.abspath(__file__)), args.salida)}: "
+          f"latexmk -pdf hojas_sin.tex hojas_con.tex")
@@ -1,39 +1,173 @@
+import argparse
+import json
+import time
+
 import numpy as np
 
-def es_entera(matriz):
-    return np.all(np.mod(matriz, 1) == 0)
+
+def matrices_unimodulares(cantidad, tam=3, max_abs=5, pasos=40, rng=None):
+    """Construye `cantidad` matrices enteras con det = ±1 y su inversa entera exacta.
+
+    Todas las matrices se generan a la vez: se parte de diagonales de ±1 y se
+    aplican `pasos` operaciones elementales enteras (fila o columna) que solo se
+    aceptan si las entradas siguen en [-max_abs, max_abs]. La inversa se lleva
+    a la par con la operación inversa, así que nunca se usa np.linalg.inv.
+    Devuelve dos arreglos (cantidad, tam, tam) de enteros: A y A⁻¹.
+    """
+    if max_abs < 1:
+        raise ValueError("max_abs debe ser al menos 1.")
+    rng = np.random.default_rng() if rng is None else rng
+    idx = np.arange(cantidad)
+    signos = rng.choice([-1, 1], size=(cantidad, tam))
+    A = np.zeros((cantidad, tam, tam), dtype=np.int64)
+    A[:, np.arange(tam), np.arange(tam)] = signos
+    A_inv = A.copy()
+
+    for _ in range(pasos):
+        i = rng.integers(0, tam, cantidad)
+        j = (i + rng.integers(1, tam, cantidad)) % tam
+        k = rng.choice([-2, -1, 1, 2], size=cantidad)
+        por_fila = rng.random(cantidad) < 0.5
+
+        # fila_i += k·fila_j   =>   columna_j de A⁻¹ -= k·columna_i
+        filas = A[idx, i, :] + k[:, None] * A[idx, j, :]
+        ok = por_fila & (np.abs(filas) <= max_abs).all(axis=1)
+        n, a, b, c = idx[ok], i[ok], j[ok], k[ok, None]
+        A[n, a, :] = filas[ok]
+        A_inv[n, :, b] -= c * A_inv[n, :, a]
+
+        # columna_i += k·columna_j   =>   fila_j de A⁻¹ -= k·fila_i
+        cols = A[idx, :, i] + k[:, None] * A[idx, :, j]
+        ok = ~por_fila & (np.abs(cols) <= max_abs).all(axis=1)
+        n, a, b, c = idx[ok], i[ok], j[ok], k[ok, None]
+        A[n, :, a] = cols[ok]
+        A_inv[n, b, :] -= c * A_inv[n, a, :]
+
+    # Permutación aleatoria de filas: (P·A)⁻¹ = A⁻¹·Pᵀ
+    perm = rng.permuted(np.tile(np.arange(tam), (cantidad, 1)), axis=1)
+    A = np.take_along_axis(A, perm[:, :, None], axis=1)
+    A_inv = np.take_along_axis(A_inv, perm[:, None, :], axis=2)
+    return A, A_inv
+
+
+def generar_matrices_enteras_inversibles(cantidad=6, rng=None):
+    A, A_inv = matrices_unimodulares(cantidad, rng=rng)
+    return list(zip(A, A_inv))
+
+
+# ----------------------------------------
+# SISTEMAS A·X = B CON SOLUCIÓN ENTERA
+# ----------------------------------------
+TAM_MIN, TAM_MAX = 2, 5
+CAMPOS = ("A", "A_inv", "X", "B")
+
+
+def verificar_sistemas(A, A_inv, X, B):
+    """Comprobación exacta en enteros: A·A⁻¹ = I y A·X = B para todos los sistemas."""
+    tam = A.shape[-1]
+    if not (A @ A_inv == np.eye(tam, dtype=np.int64)).all():
+        raise ValueError("Alguna A⁻¹ no es la inversa exacta de su matriz.")
+    if not (np.einsum("nij,nj->ni", A, X) == B).all():
+        raise ValueError("Algún B no coincide con A·X.")
+
+
+def _sorteo(cantidad, tam, max_abs, max_inv, max_x, pasos, rng):
+    """Un lote de sistemas ya filtrado por la cota de A⁻¹ (puede traer menos de `cantidad`)."""
+    A, A_inv = matrices_unimodulares(cantidad, tam, max_abs, pasos, rng)
+    X = rng.integers(-max_x, max_x + 1, size=(cantidad, tam))
+    ok = np.abs(X).any(axis=1)                        # X = 0 no es un ejercicio
+    if max_inv is not None:
+        ok &= (np.abs(A_inv) <= max_inv).all(axis=(1, 2))
+    A, A_inv, X = A[ok], A_inv[ok], X[ok]
+    return A, A_inv, X
+
+
+def generar_sistemas(cantidad, tam=3, max_abs=5, max_x=5, max_inv=None, pasos=None, rng=None):
+    """`cantidad` sistemas A·X = B distintos, con A⁻¹ y X enteras.
+
+    A tiene |entradas| <= max_abs y det = ±1 por construcción (sin determinantes
+    ni inversas en punto flotante); X tiene |entradas| <= max_x y no es nula;
+    max_inv acota opcionalmente las entradas de A⁻¹. Los sistemas repetidos
+    (misma A y misma X) se descartan con np.unique sobre las filas [A | X] y se
+    sortea otro lote hasta completar. Todo se verifica en aritmética entera.
+    Devuelve {"A", "A_inv", "X", "B"} con arreglos int64 de forma (N, tam, tam) o (N, tam).
+    """
+    if not (TAM_MIN <= tam <= TAM_MAX):
+        raise ValueError(f"El tamaño debe estar entre {TAM_MIN} y {TAM_MAX}.")
+    if max_x < 1:
+        raise ValueError("max_x debe ser al menos 1.")
+    rng = np.random.default_rng() if rng is None else rng
+    pasos = max(40, 12 * tam) if pasos is None else pasos
+
+    A = np.zeros((0, tam, tam), dtype=np.int64)
+    A_inv, X = A.copy(), np.zeros((0, tam), dtype=np.int64)
+    for _ in range(50):
+        faltan = cantidad - len(A)
+        if faltan <= 0:
+            break
+        nuevo = _sorteo(faltan + faltan // 8 + 16, tam, max_abs, max_inv, max_x, pasos, rng)
+        A, A_inv, X = (np.concatenate([viejo, n]) for viejo, n in zip((A, A_inv, X), nuevo))
+        filas = np.concatenate([A.reshape(len(A), -1), X], axis=1)
+        _, unicos = np.unique(filas, axis=0, return_index=True)
+        unicos = np.sort(unicos)[:cantidad]            # conserva el orden de sorteo
+        A, A_inv, X = A[unicos], A_inv[unicos], X[unicos]
+    if len(A) < cantidad:
+        raise ValueError(f"Solo hay {len(A)} sistemas distintos con estas cotas; se pidieron {cantidad}.")
+
+    B = np.einsum("nij,nj->ni", A, X)
+    verificar_sistemas(A, A_inv, X, B)
+    return {"A": A, "A_inv": A_inv, "X": X, "B": B}
 
 
-def generar_matrices_enteras_inversibles(cantidad=6):
-    matrices = []
-    intentos = 0
+def sistemas_a_json(sistemas):
+    """Lista de diccionarios {"A", "A_inv", "X", "B"} con listas de enteros (para LaTeX/JSON)."""
+    columnas = [sistemas[c].tolist() for c in CAMPOS]
+    return [dict(zip(CAMPOS, fila)) for fila in zip(*columnas)]
 
-    while len(matrices) < cantidad and intentos < 10000:
-        A = np.random.randint(-5, 6, (3, 3))  # Matriz con enteros entre -5 y 5
-        det = round(np.linalg.det(A))
 
-        try:
-            A_inv = np.linalg.inv(A)
-            if det in [1, -1] and es_entera(A_inv):
-                matrices.append((A, A_inv))
-        except np.linalg.LinAlgError:
-            continue  # Matriz no invertible
-        intentos += 1
+def guardar_sistemas(ruta, sistemas):
+    """.npz (arreglos) o .jsonl (un sistema por línea), según la extensión."""
+    if ruta.endswith(".npz"):
+        np.savez_compressed(ruta, **sistemas)
+        return
+    with open(ruta, "w", encoding="utf-8") as f:
+        for s in sistemas_a_json(sistemas):
+            f.write(json.dumps(s, separators=(",", ":")) + "\n")
 
-    return matrices
 
+def cargar_sistemas(ruta):
+    if ruta.endswith(".npz"):
+        with np.load(ruta) as datos:
+            return {c: datos[c] for c in CAMPOS}
+    with open(ruta, "r", encoding="utf-8") as f:
+        filas = [json.loads(linea) for linea in f if linea.strip()]
+    return {c: np.array([s[c] for s in filas], dtype=np.int64) for c in CAMPOS}
 
-# Generar matrices
-matrices = generar_matrices_enteras_inversibles()
 
-# Mostrar resultados
-for i, (A, A_inv) in enumerate(matrices):
-    print(f"\n🔢 Matriz #{i + 1} (A):\n{A}")
-    print(f"\n🧮 Inversa (A⁻¹):\n{A_inv.astype(int)}")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sistemas A·X = B con A⁻¹ y X enteras.")
+    parser.add_argument("--cantidad", type=int, default=6)
+    parser.add_argument("--tam", type=int, default=3)
+    parser.add_argument("--max-abs", type=int, default=5)
+    parser.add_argument("--max-x", type=int, default=5)
+    parser.add_argument("--max-inv", type=int, default=None)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--salida", default=None, help=".npz o .jsonl; sin salida se muestran en pantalla")
+    args = parser.parse_args()
 
-    # Ejemplo de ecuaciones simultáneas
-    B = np.random.randint(1, 10, (3, 1))
-    X = A_inv @ B
-    print(f"\n📘 Ejemplo: Resolviendo A·X = B")
-    print(f"B =\n{B}")
-    print(f"X = A⁻¹·B =\n{X.astype(int)}")
\ No newline at end of file
+    inicio = time.perf_counter()
+    sistemas = generar_sistemas(args.cantidad, args.tam, args.max_abs, args.max_x, args.max_inv,
+                                rng=np.random.default_rng(args.semilla))
+    if args.salida:
+        guardar_sistemas(args.salida, sistemas)
+        print(f"✅ {args.cantidad} sistemas {args.tam}x{args.tam} en {args.salida} "
+              f"({time.perf_counter() - inicio:.2f} s)")
+    else:
+        # Mostrar resultados
+        for i, s in enumerate(sistemas_a_json(sistemas)):
+            A, A_inv, X, B = (np.array(s[c]) for c in CAMPOS)
+            print(f"\n🔢 Matriz #{i + 1} (A):\n{A}")
+            print(f"\n🧮 Inversa (A⁻¹):\n{A_inv}")
+            print(f"\n📘 Ejemplo: Resolviendo A·X = B")
+            print(f"B =\n{B[:, None]}")
+            print(f"X = A⁻¹·B =\n{X[:, None]}")
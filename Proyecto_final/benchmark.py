@@ -0,0 +1,163 @@
+# ======================================================
+# Archivo: benchmark.py
+# Mide cada etapa del proyecto (llaves, cifrado, exportación y LaTeX) para
+# cohortes de distinto tamaño y guarda los resultados en JSON comparable.
+#
+# Uso: python benchmark.py [--tamanos 300 10000 100000] [--salida bench.json]
+# ======================================================
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+import hill_3x3_gauss as gauss
+import hill_3x3_gauss_enteros as enteros
+import hill_3x3_mod29 as mod29
+from genera_paquetes import RUTA_FRASES, leer_frases, version_alumno
+from paquetes_io import EscritorJsonl
+
+TAMANOS = (300, 10_000, 100_000)
+SEMILLA = 2025
+
+# ----------------------------------------
+# MEDICIÓN
+# ----------------------------------------
+def medir(etapa, n, funcion, memoria=True):
+    """Tiempo de pared de `funcion()` y, si memoria=True, su pico de memoria en otra corrida."""
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    resultado = {
+        "etapa": etapa,
+        "n": n,
+        "segundos": round(segundos, 6),
+        "por_segundo": round(n / segundos, 1) if segundos > 0 else None,
+    }
+    if memoria:
+        tracemalloc.start()
+        funcion()
+        resultado["memoria_pico_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return resultado
+
+def cohorte(n, frases, tipos):
+    """Repite las frases del archivo hasta tener n alumnos."""
+    reps = -(-n // len(frases))
+    return (frases * reps)[:n], (tipos * reps)[:n]
+
+# ----------------------------------------
+# ETAPAS
+# ----------------------------------------
+def etapas(n, frases, tipos, carpeta):
+    frases_n, tipos_n = cohorte(n, frases, tipos)
+    K_mod = mod29.random_invertible_matrices_3x3(n, rng=np.random.default_rng(SEMILLA))
+    K_mod_l = K_mod.tolist()
+    K_ent = [enteros.random_unimodular_matrix() for _ in range(n)]
+    K_gau = [gauss.generar_matriz_llave(exacto=True) for _ in range(n)]
+    msgs, _ = mod29.texts_to_array(frases_n)
+    C_mod = mod29.encrypt_batch(K_mod, msgs)
+    C_mod_l = [mod29.encrypt_with_key(K, f) for K, f in zip(K_mod_l, frases_n)]
+    nums_ent = [enteros.text_to_numbers(f) for f in frases_n]
+    C_ent = [enteros.encrypt(K, v) for K, v in zip(K_ent, nums_ent)]
+    paquetes = [
+        {"id": i, "tipo": t, "frase_original": f, "longitud": len(f), "K": K, "cadena_cifrada": c}
+        for i, (t, f, K, c) in enumerate(zip(tipos_n, frases_n, K_ent, C_ent), start=1)
+    ]
+
+    def escribir_jsonl():
+        with EscritorJsonl(os.path.join(carpeta, "docente.jsonl")) as d, \
+             EscritorJsonl(os.path.join(carpeta, "alumnos.jsonl")) as a:
+            for p in paquetes:
+                d.escribir(p)
+                a.escribir(version_alumno(p))
+
+    def escribir_json_indentado():
+        with open(os.path.join(carpeta, "docente.json"), "w", encoding="utf-8") as f:
+            json.dump(paquetes, f, ensure_ascii=False, indent=2)
+
+    escribir_jsonl()  # entrada de latex/maestro aunque no se mida la exportación
+
+    def tex_maestro():
+        from generar_proyecto_final_latex import generar_documento
+        generar_documento(os.path.join(carpeta, "alumnos.jsonl"), os.path.join(carpeta, "maestro.tex"))
+
+    def tex_individuales():
+        from generar_pdf_individuales import RUTA_INSTRUCCIONES, documento_alumno
+        with open(RUTA_INSTRUCCIONES, "r", encoding="utf-8") as f:
+            instrucciones = f.read()
+        for p in paquetes:
+            documento_alumno(dict(p), instrucciones)
+
+    return [
+        # Generación de llaves
+        ("llaves/mod29.random_invertible_matrix_3x3", lambda: [mod29.random_invertible_matrix_3x3() for _ in range(n)]),
+        ("llaves/mod29.random_invertible_matrices_3x3", lambda: mod29.random_invertible_matrices_3x3(n)),
+        ("llaves/enteros.random_unimodular_matrix", lambda: [enteros.random_unimodular_matrix() for _ in range(n)]),
+        ("llaves/gauss.generar_matriz_llave", lambda: [gauss.generar_matriz_llave(exacto=True) for _ in range(n)]),
+        # Cifrado y descifrado
+        ("cifrado/mod29.encrypt_with_key", lambda: [mod29.encrypt_with_key(K, f) for K, f in zip(K_mod_l, frases_n)]),
+        ("cifrado/mod29.encrypt_batch", lambda: mod29.encrypt_batch(K_mod, mod29.texts_to_array(frases_n)[0])),
+        ("descifrado/mod29.decrypt_with_key", lambda: [mod29.decrypt_with_key(K, c) for K, c in zip(K_mod_l, C_mod_l)]),
+        ("descifrado/mod29.decrypt_batch", lambda: mod29.decrypt_batch(K_mod, C_mod)),
+        ("cifrado/enteros.encrypt", lambda: [enteros.encrypt(K, enteros.text_to_numbers(f)) for K, f in zip(K_ent, frases_n)]),
+        ("descifrado/enteros.decrypt", lambda: [enteros.decrypt(K, c) for K, c in zip(K_ent, C_ent)]),
+        ("cifrado/gauss.cifrar_frase", lambda: [gauss.cifrar_frase(K, f) for K, f in zip(K_gau, frases_n)]),
+        ("cifrado/gauss.cifrar_frase_entera", lambda: [gauss.cifrar_frase_entera(K, f) for K, f in zip(K_gau, frases_n)]),
+        # Exportación
+        ("exportacion/jsonl", escribir_jsonl),
+        ("exportacion/json_indent2", escribir_json_indentado),
+        # LaTeX
+        ("latex/maestro", tex_maestro),
+        ("latex/individuales", tex_individuales),
+    ]
+
+def maquina():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del proyecto Hill 3x3.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS))
+    parser.add_argument("--salida", default=None, help="archivo JSON (por defecto, salida estándar)")
+    parser.add_argument("--sin-memoria", action="store_true", help="no medir pico de memoria")
+    parser.add_argument("--etapas", nargs="*", default=None, help="prefijos de etapas a medir")
+    args = parser.parse_args(argv)
+
+    random.seed(SEMILLA)
+    np.random.seed(SEMILLA)
+    frases, tipos = leer_frases(RUTA_FRASES)
+    resultados = []
+    with tempfile.TemporaryDirectory() as carpeta:
+        for n in args.tamanos:
+            for etapa, funcion in etapas(n, frases, tipos, carpeta):
+                if args.etapas and not any(etapa.startswith(e) for e in args.etapas):
+                    continue
+                res = medir(etapa, n, funcion, memoria=not args.sin_memoria)
+                resultados.append(res)
+                print(f"{etapa:45s} n={n:<7d} {res['segundos']:10.4f} s", file=sys.stderr)
+
+    reporte = {"fecha": datetime.now().isoformat(timespec="seconds"), "maquina": maquina(), "resultados": resultados}
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(reporte, ensure_ascii=False, indent=2))
+    return reporte
+
+
+if __name__ == "__main__":
+    main()
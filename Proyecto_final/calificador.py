@@ -0,0 +1,179 @@
+# ======================================================
+# Archivo: calificador.py
+# Califica en lote las entregas de los alumnos: invierte todas las llaves a la
+# vez, descifra todas las cadenas en una sola pasada y compara cada entrega
+# (frase descifrada y/o inversa K⁻¹) contra la clave del docente.
+#
+# Uso: python calificador.py docente.jsonl entregas.jsonl [--variante gauss]
+# Cada entrega es {"id": 7, "frase": "...", "K_inv": [[...], [...], [...]]}
+# (cualquiera de los dos campos es opcional).
+# ======================================================
+
+import argparse
+import json
+from fractions import Fraction
+
+import numpy as np
+
+import hill_3x3_gauss as gauss
+import hill_3x3_gauss_enteros as enteros
+import hill_3x3_mod29 as mod29
+from genera_paquetes import VARIANTE
+from paquetes_io import iterar_paquetes
+
+# Variante -> (codec del alfabeto, módulo o None si es aritmética entera exacta)
+VARIANTES = {
+    "mod29": (mod29.CODEC, mod29.M),
+    "enteros": (enteros.CODEC, None),
+    "gauss": (gauss.CODEC, None),
+}
+
+# Entregas mal formadas ("3/-7", K_inv de 2x2, texto en vez de números...): se
+# califican como incorrectas en vez de detener el lote
+ERRORES_ENTREGA = (ValueError, TypeError, IndexError, ZeroDivisionError, OverflowError)
+
+# ----------------------------------------
+# CLAVE DEL DOCENTE
+# ----------------------------------------
+def _a_enteros(valores):
+    arr = np.asarray(valores)
+    if arr.dtype.kind == "f":
+        if not np.array_equal(arr, np.round(arr)):
+            raise ValueError("La clave contiene valores no enteros.")
+        arr = np.round(arr)
+    return arr.astype(np.int64)
+
+def cargar_clave(ruta_docente):
+    paquetes = list(iterar_paquetes(ruta_docente))
+    ids = np.array([p["id"] for p in paquetes], dtype=np.int64)
+    Ks = _a_enteros([p["K"] for p in paquetes]).reshape(-1, 3, 3)
+    longitudes = np.array([len(p["cadena_cifrada"]) for p in paquetes], dtype=np.int64)
+    C = np.zeros((len(paquetes), int(longitudes.max(initial=0))), dtype=np.int64)
+    C[np.arange(C.shape[1]) < longitudes[:, None]] = _a_enteros(
+        [x for p in paquetes for x in p["cadena_cifrada"]])
+    frases = [p.get("frase_original", "") for p in paquetes]
+    return ids, Ks, C, longitudes, frases
+
+def invertir_y_descifrar(Ks, C, modulo=None):
+    """Inversas de todas las llaves y texto plano (N, L) de todas las cadenas.
+
+    Con módulo: K⁻¹ = det⁻¹·adj(K) mod m (tabla de inversos).
+    Sin módulo: K⁻¹ = adj(K)/det exacto, devuelto como (adj, det); el
+    descifrado divide adj·c entre det y marca las filas que no dan enteros.
+    """
+    N, L = C.shape
+    bloques = C.reshape(N, L // 3, 3)
+    if modulo is not None:
+        det = mod29.mat_det_mod_batch(Ks, modulo)
+        adj = mod29.mat_adj_mod_batch(Ks, modulo)
+        Kinv = (mod29.inv_table(modulo)[det][:, None, None] * adj) % modulo
+        P = np.einsum("nij,nbj->nbi", Kinv, bloques) % modulo
+        return Kinv, det, P.reshape(N, L), det != 0
+    adj = enteros.adjugate3_batch(Ks)
+    det = enteros.det3_batch(Ks, adj)
+    numeradores = np.einsum("nij,nbj->nbi", adj, bloques).reshape(N, L)
+    det_seguro = np.where(det == 0, 1, det)
+    exacto = (det != 0) & np.all(numeradores % det_seguro[:, None] == 0, axis=1)
+    return adj, det, numeradores // det_seguro[:, None], exacto
+
+# ----------------------------------------
+# CALIFICACIÓN
+# ----------------------------------------
+def aciertos(esperado, recibido):
+    """Fracción de posiciones que coinciden (sobre la longitud mayor)."""
+    n = max(len(esperado), len(recibido))
+    if n == 0:
+        return 1.0
+    return sum(a == b for a, b in zip(esperado, recibido)) / n
+
+def inversa_correcta(K_inv, inversa, det, modulo):
+    """Con módulo `inversa` es K⁻¹ mod m; sin módulo es adj(K) y K⁻¹ = adj/det.
+
+    Lanza alguna de ERRORES_ENTREGA si K_inv no es una matriz 3x3 de números.
+    """
+    if modulo is not None:
+        recibida = np.asarray(K_inv, dtype=np.int64)
+        if recibida.shape != (3, 3):
+            raise ValueError(f"K_inv debe ser 3x3, no {recibida.shape}")
+        return np.array_equal(recibida % modulo, inversa)
+    # adj/det exacto: se compara con fracciones (acepta "3/7", 0.5, 2, ...)
+    recibida = [[Fraction(str(x)) for x in fila] for fila in K_inv]
+    if len(recibida) != 3 or any(len(fila) != 3 for fila in recibida):
+        raise ValueError("K_inv debe ser 3x3")
+    return all(recibida[r][c] * int(det) == int(inversa[r, c]) for r in range(3) for c in range(3))
+
+def calificar(ruta_docente, ruta_entregas, variante=VARIANTE):
+    codec, modulo = VARIANTES[variante]
+    ids, Ks, C, longitudes, frases = cargar_clave(ruta_docente)
+    Kinv, det, P, validas = invertir_y_descifrar(Ks, C, modulo)
+
+    fila = {int(v): n for n, v in enumerate(ids)}
+    esperadas = [codec.normalizar(f) for f in frases]
+    descifradas = [codec.decodificar(row) for row in P.tolist()]
+
+    desajustes = []
+    # La propia clave: el descifrado debe reproducir la frase original
+    for n, (esp, des) in enumerate(zip(esperadas, descifradas)):
+        if esp and (not validas[n] or des[:len(esp)] != esp):
+            desajustes.append({"id": int(ids[n]), "campo": "clave", "esperado": esp, "recibido": des[:len(esp)]})
+
+    entregas = list(iterar_paquetes(ruta_entregas))
+    resultados = []
+    for e in entregas:
+        n = fila.get(e["id"])
+        if n is None:
+            desajustes.append({"id": e["id"], "campo": "id", "esperado": None, "recibido": e["id"]})
+            continue
+        r = {"id": e["id"]}
+        esperada = esperadas[n] or descifradas[n].rstrip(codec.inverso[codec.relleno])
+        if "frase" in e:
+            try:
+                recibida = codec.normalizar(e["frase"])
+            except ValueError:  # caracteres fuera del alfabeto mod 29
+                recibida = e["frase"].upper()
+            r["aciertos_frase"] = round(aciertos(esperada, recibida), 4)
+            r["frase_ok"] = recibida.rstrip() == esperada.rstrip()
+            if not r["frase_ok"]:
+                desajustes.append({"id": e["id"], "campo": "frase", "esperado": esperada,
+                                   "recibido": recibida, "aciertos": r["aciertos_frase"]})
+        if "K_inv" in e:
+            desajuste = {"id": e["id"], "campo": "K_inv", "recibido": e["K_inv"]}
+            try:
+                r["inversa_ok"] = inversa_correcta(e["K_inv"], Kinv[n], det[n], modulo)
+            except ERRORES_ENTREGA as err:
+                r["inversa_ok"] = False
+                desajuste["error"] = str(err)
+            if not r["inversa_ok"]:
+                desajustes.append(desajuste)
+        resultados.append(r)
+
+    resumen = {
+        "variante": variante,
+        "alumnos": len(ids),
+        "entregas": len(entregas),
+        "frases_correctas": sum(r.get("frase_ok", False) for r in resultados),
+        "inversas_correctas": sum(r.get("inversa_ok", False) for r in resultados),
+        "desajustes": len(desajustes),
+    }
+    return {"resumen": resumen, "resultados": resultados, "desajustes": desajustes}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Califica en lote las entregas del proyecto Hill.")
+    parser.add_argument("docente", help="paquetes del docente (.jsonl, .json o carpeta columnar)")
+    parser.add_argument("entregas", help="entregas de los alumnos (.jsonl o .json)")
+    parser.add_argument("--variante", choices=sorted(VARIANTES), default=VARIANTE)
+    parser.add_argument("--salida", default=None, help="guardar el reporte completo en JSON")
+    args = parser.parse_args(argv)
+
+    reporte = calificar(args.docente, args.entregas, args.variante)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+    print(json.dumps(reporte["resumen"], ensure_ascii=False, indent=2))
+    for d in reporte["desajustes"][:20]:
+        print(f"  ⚠️ {d['id']}: {d['campo']}")
+    return reporte
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# ======================================================
+# Archivo: catalogo_unimodular.py
+# Enumera UNA vez todas las matrices 3x3 enteras con entradas en [-c, c] y
+# det = ±1, y las guarda en disco con sus propiedades para elegir llaves por
+# dificultad con un sorteo O(1).
+#
+# Barrido: los cofactores de las filas 2 y 3 se calculan una sola vez para
+# las (2c+1)^6 combinaciones; para cada primera fila (a, b, c) el determinante
+# de todas ellas es a·C0 + b·C1 + c·C2 en una sola operación vectorizada. Las
+# primeras filas se reparten entre procesos.
+#
+# Almacenamiento (carpeta, un .npy por columna, ordenado por dificultad):
+#   codigos.npy      uint32  matriz codificada en base 2c+1 (9 dígitos)
+#   inversa_max.npy  uint8   máx |entrada| de K⁻¹
+#   ceros.npy        uint8   número de entradas nulas de K
+#   signo.npy        int8    det(K) (+1 o -1)
+#   crecimiento.npy  uint8   máx |valor| intermedio al eliminar K por Bareiss (sin fracciones)
+#   indice.json      cota, total y rango [inicio, fin) de cada nivel de dificultad
+#
+# Uso: python catalogo_unimodular.py [--max-abs 5] [--trabajos 4] [--salida catalogo_unimodular_5]
+# ======================================================
+
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from hill_3x3_gauss_enteros import adjugate3_batch, det3_batch
+
+MAX_ABS = 5
+FILAS_POR_TAREA = 11
+COLUMNAS = ("codigos", "inversa_max", "ceros", "signo", "crecimiento")
+# Nivel -> rango de puntaje = máx(inversa_max, crecimiento): el número más grande
+# que el alumno encuentra al invertir K a mano
+NIVELES = {"facil": (0, 9), "media": (10, 19), "dificil": (20, 255)}
+
+# ----------------------------------------
+# CODIFICACIÓN
+# ----------------------------------------
+def _pesos(max_abs):
+    return (2 * max_abs + 1) ** np.arange(8, -1, -1, dtype=np.int64)
+
+def codificar(Ks, max_abs=MAX_ABS):
+    """(N, 3, 3) -> códigos uint32 (dígitos x + max_abs en base 2·max_abs + 1)."""
+    digitos = np.asarray(Ks, dtype=np.int64).reshape(-1, 9) + max_abs
+    return (digitos @ _pesos(max_abs)).astype(np.uint32)
+
+def decodificar(codigos, max_abs=MAX_ABS):
+    """Códigos -> matrices (N, 3, 3) int64."""
+    base = 2 * max_abs + 1
+    c = np.asarray(codigos, dtype=np.int64)[..., None]
+    return ((c // _pesos(max_abs)) % base - max_abs).reshape(c.shape[:-1] + (3, 3))
+
+# ----------------------------------------
+# PROPIEDADES
+# ----------------------------------------
+def crecimiento_bareiss(Ks):
+    """Máx |valor| intermedio al eliminar K por Bareiss (sin fracciones).
+
+    En 3x3 basta el primer paso, pues el segundo solo produce det = ±1. El
+    pivote es la primera fila con entrada no nula en la columna 1; cada otra
+    fila R pasa a p·R − r₁·P, como al eliminar a mano sin fracciones.
+    """
+    n = len(Ks)
+    pivote = np.argmax(Ks[:, :, 0] != 0, axis=1)
+    P = Ks[np.arange(n), pivote]                                   # (n, 3)
+    otras = np.array([[1, 2], [0, 2], [0, 1]])[pivote]             # (n, 2)
+    R = Ks[np.arange(n)[:, None], otras]                           # (n, 2, 3)
+    paso = P[:, None, 0:1] * R[:, :, 1:] - R[:, :, 0:1] * P[:, None, 1:]
+    return np.maximum(np.abs(paso).reshape(n, -1).max(axis=1), np.abs(P[:, 0]))
+
+def propiedades(Ks):
+    Ks = np.asarray(Ks, dtype=np.int64)
+    adj = adjugate3_batch(Ks)
+    det = det3_batch(Ks, adj)
+    inversa = det[:, None, None] * adj                             # det = ±1
+    return {
+        "inversa_max": np.abs(inversa).reshape(len(Ks), -1).max(axis=1).astype(np.uint8),
+        "ceros": (Ks == 0).reshape(len(Ks), -1).sum(axis=1).astype(np.uint8),
+        "signo": det.astype(np.int8),
+        "crecimiento": crecimiento_bareiss(Ks).astype(np.uint8),
+    }
+
+def puntaje(columnas):
+    return np.maximum(columnas["inversa_max"], columnas["crecimiento"])
+
+# ----------------------------------------
+# ENUMERACIÓN
+# ----------------------------------------
+@lru_cache(maxsize=2)
+def _cofactores_filas_2_3(max_abs):
+    """C0, C1, C2 (cofactores de la fila 1) para todas las filas 2 y 3 posibles, en orden de código."""
+    v = np.arange(-max_abs, max_abs + 1, dtype=np.int32)
+    d, e, f, g, h, i = (x.reshape(-1) for x in np.meshgrid(v, v, v, v, v, v, indexing="ij"))
+    return e*i - f*h, f*g - d*i, d*h - e*g
+
+def _barrido(args):
+    """Códigos y propiedades de las matrices unimodulares con primera fila en [inicio, fin)."""
+    inicio, fin, max_abs = args
+    base = 2 * max_abs + 1
+    C0, C1, C2 = _cofactores_filas_2_3(max_abs)
+    bloque = base ** 6
+    codigos = []
+    for fila in range(inicio, fin):
+        a, b, c = (fila // base**2) - max_abs, (fila // base) % base - max_abs, fila % base - max_abs
+        det = a*C0 + b*C1 + c*C2
+        resto = np.flatnonzero(np.abs(det) == 1)
+        codigos.append((fila * bloque + resto).astype(np.uint32))
+    codigos = np.concatenate(codigos) if codigos else np.zeros(0, dtype=np.uint32)
+    return {"codigos": codigos, **propiedades(decodificar(codigos, max_abs))}
+
+def enumerar(max_abs=MAX_ABS, trabajos=None):
+    """Todas las matrices 3x3 con |entradas| <= max_abs y det = ±1, con sus propiedades."""
+    if not 1 <= max_abs <= 5:
+        raise ValueError("max_abs debe estar entre 1 y 5 (los códigos caben en uint32).")
+    primeras = (2 * max_abs + 1) ** 3
+    tareas = [(k, min(k + FILAS_POR_TAREA, primeras), max_abs) for k in range(0, primeras, FILAS_POR_TAREA)]
+    with ProcessPoolExecutor(max_workers=trabajos or os.cpu_count() or 1) as pool:
+        partes = list(pool.map(_barrido, tareas))
+    return {col: np.concatenate([p[col] for p in partes]) for col in COLUMNAS}
+
+def guardar_catalogo(carpeta, columnas, max_abs=MAX_ABS):
+    """Ordena por dificultad (puntaje, luego más ceros primero) y guarda una columna por archivo."""
+    os.makedirs(carpeta, exist_ok=True)
+    p = puntaje(columnas)
+    orden = np.lexsort((columnas["codigos"], -columnas["ceros"].astype(np.int16), p))
+    for col in COLUMNAS:
+        np.save(os.path.join(carpeta, col + ".npy"), columnas[col][orden])
+    p = p[orden]
+    niveles = {nombre: [int(np.searchsorted(p, lo, "left")), int(np.searchsorted(p, hi, "right"))]
+               for nombre, (lo, hi) in NIVELES.items()}
+    with open(os.path.join(carpeta, "indice.json"), "w", encoding="utf-8") as f:
+        json.dump({"max_abs": max_abs, "total": int(len(p)), "niveles": niveles}, f, indent=2)
+
+# ----------------------------------------
+# LECTURA Y SORTEO
+# ----------------------------------------
+class Catalogo:
+    """Catálogo en disco (memoria mapeada); sortear() es O(1) por llave."""
+
+    def __init__(self, carpeta, mmap_mode="r"):
+        with open(os.path.join(carpeta, "indice.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.carpeta = carpeta
+        self.max_abs = meta["max_abs"]
+        self.niveles = {k: tuple(v) for k, v in meta["niveles"].items()}
+        self.columnas = {col: np.load(os.path.join(carpeta, col + ".npy"), mmap_mode=mmap_mode)
+                         for col in COLUMNAS}
+
+    def __len__(self):
+        return len(self.columnas["codigos"])
+
+    def matriz(self, n):
+        return decodificar(self.columnas["codigos"][n], self.max_abs).tolist()
+
+    def propiedades(self, n):
+        return {col: int(self.columnas[col][n]) for col in COLUMNAS if col != "codigos"}
+
+    def sortear(self, rng=random, dificultad=None):
+        """Posición al azar dentro del nivel pedido (o de todo el catálogo)."""
+        inicio, fin = (0, len(self)) if dificultad is None else self.niveles[dificultad]
+        if fin <= inicio:
+            raise ValueError(f"El nivel '{dificultad}' no tiene matrices con max_abs={self.max_abs}.")
+        return inicio + rng.randrange(fin - inicio)
+
+    def filtrar(self, **cotas):
+        """Posiciones que cumplen cotas (min, max) por columna, p. ej. filtrar(ceros=(3, 9), signo=(1, 1))."""
+        mascara = np.ones(len(self), dtype=bool)
+        for col, (lo, hi) in cotas.items():
+            valores = self.columnas[col]
+            mascara &= (valores >= lo) & (valores <= hi)
+        return np.flatnonzero(mascara)
+
+def resumen(carpeta):
+    cat = Catalogo(carpeta)
+    lineas = [f"{len(cat):,} matrices unimodulares con |entradas| <= {cat.max_abs}"]
+    for nombre, (inicio, fin) in cat.niveles.items():
+        lineas.append(f"  {nombre:8s} {fin - inicio:>12,d}")
+    return "\n".join(lineas)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Catálogo de llaves unimodulares 3x3 acotadas.")
+    parser.add_argument("--max-abs", type=int, default=MAX_ABS)
+    parser.add_argument("--trabajos", type=int, default=None)
+    parser.add_argument("--salida", default=None, help="carpeta (por defecto catalogo_unimodular_<max-abs>)")
+    args = parser.parse_args(argv)
+
+    carpeta = args.salida or f"catalogo_unimodular_{args.max_abs}"
+    guardar_catalogo(carpeta, enumerar(args.max_abs, args.trabajos), args.max_abs)
+    print(resumen(carpeta))
+
+
+if __name__ == "__main__":
+    main()
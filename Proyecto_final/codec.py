@@ -0,0 +1,88 @@
+# ======================================================
+# Archivo: codec.py
+# Conversión texto <-> números compartida por los módulos Hill.
+# Cada alfabeto tiene un Codec que arma una sola vez sus tablas de
+# str.translate y de bytes -> número, y convierte corpus completos a NumPy.
+# ======================================================
+
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+class _TablaTraduccion(dict):
+    """Tabla para str.translate que calcula (y guarda) cada carácter la primera vez que aparece."""
+
+    def __init__(self, normalizar_char: Callable[[str], str]):
+        super().__init__()
+        self._normalizar_char = normalizar_char
+
+    def __missing__(self, codigo: int) -> str:
+        salida = self._normalizar_char(chr(codigo))
+        self[codigo] = salida
+        return salida
+
+class Codec:
+    """Codificador de un alfabeto Hill.
+
+    simbolos: {carácter: número}. Todos los caracteres deben caber en latin-1
+    (A..Z, Ñ, espacio y puntuación), así el texto ya normalizado se convierte a
+    bytes y cada byte a su número con una tabla de 256 entradas.
+    normalizar_char: regla para un solo carácter de entrada -> texto ya en el
+    alfabeto ('' lo descarta; puede lanzar ValueError si no está permitido).
+    """
+
+    def __init__(self, simbolos: Dict[str, int], normalizar_char: Callable[[str], str],
+                 relleno: int, cache: int = 4096):
+        self.simbolos = dict(simbolos)
+        self.inverso = {v: k for k, v in self.simbolos.items()}
+        self.relleno = relleno
+        self._tabla = _TablaTraduccion(normalizar_char)
+        self._lut = np.full(256, -1, dtype=np.int16)
+        for ch, n in self.simbolos.items():
+            self._lut[ord(ch.encode("latin-1"))] = n
+        self.codificar = lru_cache(maxsize=cache)(self._codificar)
+
+    # ---------- Texto ----------
+    def normalizar(self, texto: str) -> str:
+        return texto.translate(self._tabla)
+
+    def _codificar(self, texto: str) -> Tuple[int, ...]:
+        """Frase -> tupla de números (con caché LRU para frases repetidas)."""
+        return tuple(self.a_arreglo(texto).tolist())
+
+    def a_arreglo(self, texto: str) -> np.ndarray:
+        datos = self.normalizar(texto).encode("latin-1")
+        return self._lut[np.frombuffer(datos, dtype=np.uint8)].astype(np.int64)
+
+    def decodificar(self, nums: Sequence[int], desconocido: str = "?") -> str:
+        return "".join(self.inverso.get(n, desconocido) for n in nums)
+
+    # ---------- Corpus ----------
+    def corpus_a_arreglo(self, textos: Sequence[str], multiplo: int = 3,
+                         longitud: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """N frases -> arreglo (N, L) int64 rellenado con `relleno`, y sus longitudes.
+
+        Todo el corpus se normaliza, se pasa a bytes y se traduce en una sola
+        operación; L es la longitud máxima (o `longitud`) redondeada a `multiplo`.
+        Lanza ValueError si `longitud` no alcanza para la frase más larga.
+        """
+        normalizados: List[str] = [self.normalizar(t) for t in textos]
+        longitudes = np.fromiter((len(t) for t in normalizados), dtype=np.int64, count=len(normalizados))
+        maximo = int(longitudes.max(initial=0))
+        if longitud is not None and longitud < maximo:
+            raise ValueError(f"longitud={longitud} es menor que la frase más larga ({maximo} caracteres).")
+        L = maximo if longitud is None else longitud
+        L += (-L) % multiplo
+        datos = np.frombuffer("".join(normalizados).encode("latin-1"), dtype=np.uint8)
+        out = np.full((len(normalizados), L), self.relleno, dtype=np.int64)
+        out[np.arange(L) < longitudes[:, None]] = self._lut[datos]
+        return out, longitudes
+
+# ----------------------------------------
+# Reglas de normalización por carácter
+# ----------------------------------------
+def sin_acentos(ch: str) -> str:
+    """Quita marcas diacríticas (NFD sin categoría Mn)."""
+    return "".join(c for c in unicodedata.normalize("NFD", ch) if unicodedata.category(c) != "Mn")
@@ -0,0 +1,169 @@
+# ======================================================
+# Archivo: compilar_pdfs.py
+# Compila en paralelo los .tex de los alumnos, saltando los que no cambiaron.
+# ======================================================
+
+import hashlib
+import json
+import os
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import instrumentacion as perfil
+
+LATEXMK = ["latexmk", "-pdf", "-interaction=nonstopmode", "-halt-on-error"]
+MANIFIESTO = ".hashes_tex.json"      # {nombre.tex: sha256 del contenido compilado}
+REPORTE = "reporte_compilacion.json"
+AUXILIARES = (".aux", ".log", ".fls", ".fdb_latexmk", ".out")
+
+# ----------------------------------------
+# UTILIDADES
+# ----------------------------------------
+def hash_archivo(ruta):
+    with open(ruta, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def errores_log(ruta_log, max_errores=5):
+    """Extrae los mensajes '! ...' del .log con la línea 'l.NN' que los ubica."""
+    if not os.path.exists(ruta_log):
+        return []
+    with open(ruta_log, "r", encoding="latin-1") as f:
+        lineas = f.read().splitlines()
+    errores = []
+    for n, linea in enumerate(lineas):
+        if linea.startswith("!"):
+            ubicacion = next((l for l in lineas[n + 1:n + 15] if l.startswith("l.")), "")
+            errores.append({"mensaje": linea[1:].strip(), "linea": ubicacion.strip()})
+            if len(errores) >= max_errores:
+                break
+    return errores
+
+def limpiar_auxiliares(ruta_tex):
+    base = os.path.splitext(ruta_tex)[0]
+    for ext in AUXILIARES:
+        if os.path.exists(base + ext):
+            os.remove(base + ext)
+
+def _leer_manifiesto(carpeta):
+    ruta = os.path.join(carpeta, MANIFIESTO)
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _guardar_manifiesto(carpeta, manifiesto):
+    with open(os.path.join(carpeta, MANIFIESTO), "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, indent=0, sort_keys=True)
+
+# ----------------------------------------
+# COMPILACIÓN
+# ----------------------------------------
+def compilar_tex(ruta_tex, comando=None):
+    """Compila un .tex en su propia carpeta y devuelve un registro del resultado."""
+    carpeta = os.path.dirname(ruta_tex) or "."
+    comando = (comando or LATEXMK) + [f"-outdir={carpeta}", ruta_tex]
+    inicio = time.perf_counter()
+    try:
+        codigo = subprocess.run(comando, stdout=subprocess.PIPE, stderr=subprocess.STDOUT).returncode
+    except FileNotFoundError:
+        codigo = 127  # compilador no instalado
+    return registro_compilacion(ruta_tex, codigo, time.perf_counter() - inicio)
+
+def registro_compilacion(ruta_tex, codigo, segundos):
+    """Registro de una compilación ya terminada (limpia auxiliares o extrae errores)."""
+    resultado = {
+        "tex": ruta_tex,
+        "ok": codigo == 0,
+        "codigo": codigo,
+        "segundos": round(segundos, 3),
+    }
+    if resultado["ok"]:
+        limpiar_auxiliares(ruta_tex)
+    else:
+        resultado["errores"] = errores_log(os.path.splitext(ruta_tex)[0] + ".log")
+    return resultado
+
+def generar_formato(ruta_fuente):
+    """Vuelca el preámbulo de `ruta_fuente` a un formato precompilado (.fmt).
+
+    Usa mylatexformat: todo lo anterior a \\endofdump queda en el formato, y al
+    compilar con -fmt esa parte del documento se salta. Solo se regenera si la
+    fuente es más reciente que el .fmt. Devuelve la ruta del formato sin extensión.
+    """
+    carpeta = os.path.dirname(ruta_fuente) or "."
+    nombre = os.path.splitext(os.path.basename(ruta_fuente))[0]
+    ruta_fmt = os.path.join(carpeta, nombre + ".fmt")
+    if not os.path.exists(ruta_fmt) or os.path.getmtime(ruta_fmt) < os.path.getmtime(ruta_fuente):
+        subprocess.run(
+            ["pdflatex", "-ini", "-interaction=nonstopmode", f"-jobname={nombre}",
+             f"-output-directory={carpeta}", "&pdflatex", "mylatexformat.ltx", ruta_fuente],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=True,
+        )
+    return os.path.abspath(os.path.splitext(ruta_fmt)[0])
+
+def comando_con_formato(ruta_formato):
+    """Comando latexmk que compila cargando el formato precompilado."""
+    return LATEXMK + [f"-pdflatex=pdflatex -fmt={ruta_formato} %O %S"]
+
+def pendientes_de_compilar(rutas_tex, manifiesto):
+    """Separa los .tex cuyo contenido cambió (o sin PDF) de los que ya están al día."""
+    pendientes, al_dia = [], []
+    for ruta in rutas_tex:
+        nombre = os.path.basename(ruta)
+        pdf = os.path.splitext(ruta)[0] + ".pdf"
+        h = hash_archivo(ruta)
+        if manifiesto.get(nombre) == h and os.path.exists(pdf):
+            al_dia.append(ruta)
+        else:
+            pendientes.append((ruta, h))
+    return pendientes, al_dia
+
+def compilar_lote(rutas_tex, trabajos=None, forzar=False, comando=None):
+    """Compila los .tex de una carpeta en un pool de procesos.
+
+    Solo se compilan los archivos cuyo hash no coincide con el registrado en el
+    manifiesto de la carpeta (o forzar=True). Devuelve el reporte y lo guarda
+    en `reporte_compilacion.json` junto a los PDFs.
+    """
+    rutas_tex = list(rutas_tex)
+    if not rutas_tex:
+        return {"compilados": [], "omitidos": [], "fallidos": []}
+    carpeta = os.path.dirname(rutas_tex[0]) or "."
+    manifiesto = {} if forzar else _leer_manifiesto(carpeta)
+    pendientes, al_dia = pendientes_de_compilar(rutas_tex, manifiesto)
+
+    reporte = {"compilados": [], "omitidos": al_dia, "fallidos": []}
+    if pendientes:
+        trabajos = trabajos or os.cpu_count() or 1
+        rutas = [r for r, _ in pendientes]
+        with ProcessPoolExecutor(max_workers=trabajos) as pool:
+            resultados = pool.map(compilar_tex, rutas, [comando] * len(rutas))
+            for (ruta, h), res in zip(pendientes, resultados):
+                perfil.registrar("latex.compilacion", res["segundos"], os.path.basename(ruta))
+                if res["ok"]:
+                    manifiesto[os.path.basename(ruta)] = h
+                    reporte["compilados"].append(res)
+                else:
+                    manifiesto.pop(os.path.basename(ruta), None)
+                    reporte["fallidos"].append(res)
+        _guardar_manifiesto(carpeta, manifiesto)
+
+    guardar_reporte(carpeta, reporte)
+    return reporte
+
+def guardar_reporte(carpeta, reporte):
+    with open(os.path.join(carpeta, REPORTE), "w", encoding="utf-8") as f:
+        json.dump(reporte, f, ensure_ascii=False, indent=2)
+
+def resumen_reporte(reporte):
+    lineas = [
+        f"Compilados: {len(reporte['compilados'])}  "
+        f"Sin cambios: {len(reporte['omitidos'])}  "
+        f"Fallidos: {len(reporte['fallidos'])}"
+    ]
+    for res in reporte["fallidos"]:
+        lineas.append(f"  ⚠️ {res['tex']} (código {res['codigo']})")
+        for err in res.get("errores", []):
+            lineas.append(f"     ! {err['mensaje']}  {err['linea']}")
+    return "\n".join(lineas)
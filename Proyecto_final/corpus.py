@@ -0,0 +1,137 @@
+# ======================================================
+# Archivo: corpus.py
+# Carga los archivos de frases ("NNN: FRASE|tipo") una sola vez y los deja
+# validados: para cada frase se guarda su forma normalizada en cada alfabeto,
+# su longitud, su tipo y si cabe en cada alfabeto. Las frases se agrupan en
+# cubetas por número de bloques de 3 (ya con relleno), para cifrar cada cubeta
+# como un solo arreglo de longitud fija sin revisar frase por frase (así lo
+# hace genera_paquetes con la variante mod29).
+# ======================================================
+
+import os
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+import hill_3x3_gauss as gauss
+import hill_3x3_gauss_enteros as enteros
+import hill_3x3_mod29 as mod29
+
+# Alfabeto -> codec (mismo nombre que las variantes de genera_paquetes y calificador)
+ALFABETOS = {
+    "mod29": mod29.CODEC,
+    "enteros": enteros.CODEC,
+    "gauss": gauss.CODEC,
+}
+LONGITUD_MOD29 = (90, 110)  # rango que exige hill_3x3_mod29.package_for_student
+
+class Frase(NamedTuple):
+    id: int
+    texto: str                    # tal como viene en el archivo (sin el índice ni el tipo)
+    tipo: str
+    longitud: int
+    bloques: int                  # bloques de 3 después de rellenar
+    normalizadas: Dict[str, str]  # alfabeto -> texto normalizado ('' si no se puede)
+    valida: Dict[str, bool]       # alfabeto -> la frase cabe sin perder caracteres
+
+def _normalizar(codec, texto):
+    try:
+        return codec.normalizar(texto)
+    except ValueError:  # carácter fuera del alfabeto mod 29
+        return ""
+
+def _es_valida(alfabeto, texto, normalizada):
+    if len(normalizada) != len(texto):
+        return False  # el alfabeto descartó o no admite algún carácter
+    if alfabeto == "mod29":
+        return len(texto) % 3 == 0 and LONGITUD_MOD29[0] <= len(texto) <= LONGITUD_MOD29[1]
+    return True
+
+def crear_frase(i, texto, tipo) -> Frase:
+    normalizadas = {a: _normalizar(c, texto) for a, c in ALFABETOS.items()}
+    return Frase(
+        id=i,
+        texto=texto,
+        tipo=tipo,
+        longitud=len(texto),
+        bloques=-(-len(texto) // 3),
+        normalizadas=normalizadas,
+        valida={a: _es_valida(a, texto, n) for a, n in normalizadas.items()},
+    )
+
+def parsear_linea(linea) -> Tuple[str, str]:
+    """'NNN: FRASE|tipo' -> (frase, tipo); conserva la longitud y los espacios internos."""
+    izquierda, _, tipo = linea.rstrip("\n\r").partition("|")
+    return izquierda.split(": ", 1)[1], tipo.strip()
+
+class Corpus:
+    def __init__(self, frases: List[Frase], ruta: str = None):
+        self.frases = frases
+        self.ruta = ruta
+
+    def __len__(self):
+        return len(self.frases)
+
+    def __iter__(self) -> Iterator[Frase]:
+        return iter(self.frases)
+
+    @property
+    def textos(self) -> List[str]:
+        return [f.texto for f in self.frases]
+
+    @property
+    def tipos(self) -> List[str]:
+        return [f.tipo for f in self.frases]
+
+    def validas(self, alfabeto) -> List[Frase]:
+        return [f for f in self.frases if f.valida[alfabeto]]
+
+    def invalidas(self, alfabeto) -> List[Frase]:
+        return [f for f in self.frases if not f.valida[alfabeto]]
+
+    def cubetas(self, alfabeto=None) -> Dict[int, List[Frase]]:
+        """bloques -> frases con ese número de bloques (solo las válidas si se da alfabeto)."""
+        salida: Dict[int, List[Frase]] = {}
+        for f in (self.frases if alfabeto is None else self.validas(alfabeto)):
+            salida.setdefault(f.bloques, []).append(f)
+        return dict(sorted(salida.items()))
+
+    def arreglos(self, alfabeto) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Por cubeta: (ids (n,), mensajes (n, 3·bloques) int64 rellenados)."""
+        codec = ALFABETOS[alfabeto]
+        for bloques, frases in self.cubetas(alfabeto).items():
+            ids = np.fromiter((f.id for f in frases), dtype=np.int64, count=len(frases))
+            msgs, _ = codec.corpus_a_arreglo([f.normalizadas[alfabeto] for f in frases], longitud=3 * bloques)
+            yield ids, msgs
+
+    def resumen(self) -> str:
+        lineas = [f"{len(self)} frases, {len(self.cubetas())} longitudes distintas (en bloques de 3)."]
+        for a in ALFABETOS:
+            malas = self.invalidas(a)
+            lineas.append(f"  {a}: {len(self) - len(malas)} válidas" +
+                          (f" (no caben: {', '.join(str(f.id) for f in malas[:10])}{'…' if len(malas) > 10 else ''})" if malas else ""))
+        return "\n".join(lineas)
+
+@lru_cache(maxsize=16)
+def _cargar(ruta, _mtime_ns, _tamano) -> Corpus:
+    frases = []
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            if "|" in linea:
+                texto, tipo = parsear_linea(linea)
+                frases.append(crear_frase(len(frases) + 1, texto, tipo))
+    return Corpus(frases, ruta)
+
+def cargar_corpus(ruta) -> Corpus:
+    """Corpus del archivo; se vuelve a parsear solo si el archivo cambió."""
+    ruta = os.path.abspath(ruta)
+    st = os.stat(ruta)
+    return _cargar(ruta, st.st_mtime_ns, st.st_size)
+
+
+if __name__ == "__main__":
+    import sys
+    for ruta in sys.argv[1:] or ["frases/frases_300_motivacionales_v3.txt"]:
+        print(ruta)
+        print(cargar_corpus(ruta).resumen())
@@ -0,0 +1,79 @@
+# ======================================================
+# Archivo: dividir_pdf.py
+# Compila una sola vez el documento maestro (todos los proyectos) y lo separa
+# en un PDF por alumno usando las páginas registradas en <maestro>.pags.
+# ======================================================
+
+import os
+
+from pypdf import PdfReader, PdfWriter
+
+from compilar_pdfs import compilar_tex, resumen_reporte
+import instrumentacion as perfil
+
+# ----------------------------------------
+# CONFIGURACIÓN DE RUTAS
+# ----------------------------------------
+RUTA_MAESTRO = "frases/Proyecto_Final_Algebra_Lineal_v2.tex"
+CARPETA_SALIDA = "Proyecto_final_individual/pdfs_alumnos"
+CON_PORTADA = True  # antepone portada, introducción e instrucciones a cada alumno
+
+# ----------------------------------------
+# RANGOS DE PÁGINAS
+# ----------------------------------------
+def leer_inicios(ruta_pags):
+    """Lee las líneas "id página" que escribe el maestro (página física, base 1)."""
+    inicios = []
+    with open(ruta_pags, "r", encoding="utf-8") as f:
+        for linea in f:
+            partes = linea.split()
+            if len(partes) == 2:
+                inicios.append((int(partes[0]), int(partes[1])))
+    return inicios
+
+def rangos_por_proyecto(inicios, total_paginas):
+    """{id: (primera, última)} en base 1; cada proyecto llega hasta antes del siguiente."""
+    rangos = {}
+    for n, (pid, ini) in enumerate(inicios):
+        fin = inicios[n + 1][1] - 1 if n + 1 < len(inicios) else total_paginas
+        rangos[pid] = (ini, max(ini, fin))
+    return rangos
+
+# ----------------------------------------
+# DIVISIÓN DEL PDF
+# ----------------------------------------
+def dividir_maestro(ruta_pdf, carpeta_salida, ruta_pags=None, con_portada=CON_PORTADA):
+    """Separa el PDF maestro en Proyecto_NNN.pdf, uno por alumno. Devuelve las rutas."""
+    ruta_pags = ruta_pags or os.path.splitext(ruta_pdf)[0] + ".pags"
+    lector = PdfReader(ruta_pdf)
+    inicios = leer_inicios(ruta_pags)
+    rangos = rangos_por_proyecto(inicios, len(lector.pages))
+    portada = range(0, inicios[0][1] - 1) if (con_portada and inicios) else range(0)
+
+    os.makedirs(carpeta_salida, exist_ok=True)
+    rutas = []
+    for pid, (ini, fin) in rangos.items():
+        escritor = PdfWriter()
+        for n in list(portada) + list(range(ini - 1, fin)):
+            escritor.add_page(lector.pages[n])
+        ruta = os.path.join(carpeta_salida, f"Proyecto_{pid:03d}.pdf")
+        with open(ruta, "wb") as f:
+            escritor.write(f)
+        rutas.append(ruta)
+    return rutas
+
+def main(ruta_maestro=RUTA_MAESTRO, carpeta_salida=CARPETA_SALIDA):
+    # Una sola corrida de LaTeX para todos los alumnos
+    res = compilar_tex(ruta_maestro)
+    perfil.registrar("latex.compilacion", res["segundos"], os.path.basename(ruta_maestro))
+    if not res["ok"]:
+        print(resumen_reporte({"compilados": [], "omitidos": [], "fallidos": [res]}))
+        return []
+    ruta_pdf = os.path.splitext(ruta_maestro)[0] + ".pdf"
+    rutas = dividir_maestro(ruta_pdf, carpeta_salida)
+    print(f"✅ {len(rutas)} PDFs individuales separados del maestro en: {carpeta_salida}/")
+    return rutas
+
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,181 @@
 # generar_paquetes_300_final.py
 # Genera 300 matrices llave y mensajes cifrados, exportando versión docente y versión alumno.
 
-import json, random
-from hill_3x3_gauss import package_for_student, pretty_matrix
-#from hill_3x3_gauss_enteros import package_for_student, pretty_matrix
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import hill_3x3_gauss
+import hill_3x3_gauss_enteros
+import hill_3x3_mod29
+from paquetes_io import EscritorJsonl
+from indice_unicidad import IndiceUnicidad
+from corpus import Corpus, cargar_corpus, crear_frase
+from semillas import SEMILLA_MAESTRA, flujo_alumno
+import instrumentacion as perfil
 
 carpeta = "frases/"
 RUTA_FRASES = f"{carpeta}frases_300_motivacionales_v3.txt"
-SALIDA_DOCENTE = f"{carpeta}paquetes_300_docente.json"
-SALIDA_ALUMNOS = f"{carpeta}paquetes_300_alumnos.json"
+SALIDA_DOCENTE = f"{carpeta}paquetes_300_docente.jsonl"
+SALIDA_ALUMNOS = f"{carpeta}paquetes_300_alumnos.jsonl"
+MAX_INTENTOS = 10  # regeneraciones por alumno si su llave o cifrado colisiona
+SEMILLA = SEMILLA_MAESTRA  # misma semilla -> mismos paquetes, con cualquier número de procesos
+TRABAJOS = 1               # procesos para repartir la generación
+LOTE = 64                  # alumnos por tarea enviada a cada proceso
+
+# Variante de cifrado -> módulo con package_for_student y pretty_matrix
+VARIANTES = {
+    "gauss": hill_3x3_gauss,
+    "enteros": hill_3x3_gauss_enteros,
+    "mod29": hill_3x3_mod29,
+}
+VARIANTE = "gauss"
 
 
 #RUTA_FRASES = f"{carpeta}frases_120_cortas.txt"
-#SALIDA_DOCENTE = f"{carpeta}paquetes_docente_120_enteros.json"
-#SALIDA_ALUMNOS = f"{carpeta}paquetes_alumnos_120_enteros.json"
+#SALIDA_DOCENTE = f"{carpeta}paquetes_docente_120_enteros.jsonl"
+#SALIDA_ALUMNOS = f"{carpeta}paquetes_alumnos_120_enteros.jsonl"
 
 # Leer frases y tipo (sin alterar longitud ni borrar espacios internos)
-frases, tipos = [], []
-with open(RUTA_FRASES, "r", encoding="utf-8") as f:
-    for line in f:
-        line = line.rstrip("\n\r")                     # quitar solo saltos de línea
-        if "| " in line or "|" in line:
-            left, _, tipo = line.partition("|")         # separa la frase del tipo
-            frase = left.split(": ", 1)[1]              # elimina el índice inicial
-            frases.append(frase)
-            tipos.append(tipo.strip())
-
-print(f"Se cargaron {len(frases)} frases (longitud promedio: {sum(len(f) for f in frases)/len(frases):.1f} caracteres).")
-
-# Generar matrices llave e información cifrada
-paquetes_docente, paquetes_alumnos = [], []
-
-for i, frase in enumerate(frases, start=1):
-    K, cipher = package_for_student(i, frase)
-    tipo = tipos[i - 1] if i - 1 < len(tipos) else (
+def leer_frases(ruta):
+    corpus = cargar_corpus(ruta)
+    return corpus.textos, corpus.tipos
+
+def revisar_corpus(corpus, variante):
+    """Avisa (o falla, si la variante las rechazaría) sobre frases que no caben en el alfabeto."""
+    malas = corpus.invalidas(variante)
+    if not malas:
+        return
+    ids = ", ".join(f"{f.id:03d}" for f in malas[:10]) + ("…" if len(malas) > 10 else "")
+    if variante == "mod29":
+        raise ValueError(f"{len(malas)} frases no sirven para mod 29 (longitud o caracteres): {ids}")
+    print(f"⚠️ {len(malas)} frases pierden caracteres en el alfabeto '{variante}': {ids}")
+
+def tipo_por_defecto(i, tipos):
+    return tipos[i - 1] if i - 1 < len(tipos) else (
         "easter" if i <= 100 else ("celebre" if i <= 200 else "motivacional")
     )
 
-    # Versión completa (docente)
-    paquetes_docente.append({
+def armar_paquete(i, frase, tipo, K, cipher, intento=0):
+    p = {
         "id": i,
         "tipo": tipo,
         "frase_original": frase,
         "longitud": len(frase),
         "K": K,
         "cadena_cifrada": cipher
-    })
+    }
+    if intento:
+        p["intento"] = intento  # para reproducirlo: paquete_alumno(..., intento=p["intento"])
+    return p
+
+# Un paquete depende solo de (semilla, id, intento): se puede regenerar un alumno suelto
+def paquete_alumno(i, frase, tipo, semilla=SEMILLA, intento=0, variante=VARIANTE):
+    with perfil.etapa("genera_paquetes.paquete"):
+        K, cipher = VARIANTES[variante].package_for_student(i, frase, rng=flujo_alumno(semilla, i, intento))
+    return armar_paquete(i, frase, tipo, K, cipher, intento)
+
+def _lote_mod29(inicio, frases, tipos, semilla):
+    """Intento 0 de la variante mod29 por cubetas de longitud del corpus.
+
+    Cada alumno sortea su llave con su propio flujo (igual que package_for_student)
+    y cada cubeta se cifra con un solo encrypt_batch; la longitud ya la validó el corpus.
+    """
+    corpus = Corpus([crear_frase(i, f, t) for i, (f, t) in enumerate(zip(frases, tipos), start=inicio)])
+    malas = corpus.invalidas("mod29")
+    if malas:
+        raise ValueError(f"Frases que no sirven para mod 29 (longitud o caracteres): {[f.id for f in malas[:10]]}")
+    with perfil.etapa("genera_paquetes.llaves"):
+        llaves = {f.id: hill_3x3_mod29.random_invertible_matrix_3x3(rng=flujo_alumno(semilla, f.id, 0)) for f in corpus}
+    cifrados = {}
+    with perfil.etapa("genera_paquetes.cifrado_cubetas"):
+        for ids, msgs in corpus.arreglos("mod29"):
+            ids = ids.tolist()
+            Ks = np.array([llaves[i] for i in ids], dtype=np.int64)
+            cifrados.update(zip(ids, hill_3x3_mod29.encrypt_batch(Ks, msgs).tolist()))
+    return [armar_paquete(f.id, f.texto, f.tipo, llaves[f.id], cifrados[f.id]) for f in corpus]
+
+# Variantes con un camino por lotes para el intento 0 (las demás van paquete por paquete)
+LOTES = {"mod29": _lote_mod29}
+
+def _lote(args):
+    inicio, frases, tipos, semilla, variante = args
+    if variante in LOTES:
+        return LOTES[variante](inicio, frases, tipos, semilla)
+    return [paquete_alumno(i, f, t, semilla, 0, variante) for i, (f, t) in enumerate(zip(frases, tipos), start=inicio)]
 
+def _configuracion_trabajador(variante):
+    """Estado de módulo que los procesos del pool no heredan con spawn/forkserver (el catálogo)."""
+    catalogo = getattr(VARIANTES[variante], "CATALOGO", None)
+    return None if catalogo is None else (catalogo.carpeta, VARIANTES[variante].DIFICULTAD)
+
+def _iniciar_trabajador(variante, catalogo):
+    if catalogo is not None:
+        VARIANTES[variante].usar_catalogo(*catalogo)
+
+def _primeros_intentos(frases, tipos, semilla, trabajos, variante):
+    """Paquetes con intento 0, en orden de id, por lotes de LOTE alumnos (repartidos entre procesos si trabajos > 1)."""
+    tareas = [(k + 1, frases[k:k + LOTE], tipos[k:k + LOTE], semilla, variante) for k in range(0, len(frases), LOTE)]
+    if trabajos <= 1:
+        for tarea in tareas:
+            yield from _lote(tarea)
+        return
+    with ProcessPoolExecutor(max_workers=trabajos, initializer=_iniciar_trabajador,
+                             initargs=(variante, _configuracion_trabajador(variante))) as pool:
+        for lote in pool.map(_lote, tareas):
+            yield from lote
+
+# Generar matrices llave e información cifrada (un paquete a la vez)
+def generar_paquetes(frases, tipos, indice=None, semilla=SEMILLA, trabajos=TRABAJOS, variante=VARIANTE):
+    tipos = [tipo_por_defecto(i, tipos) for i in range(1, len(frases) + 1)]
+    for p in _primeros_intentos(frases, tipos, semilla, trabajos, variante):
+        if indice is not None:
+            # Llave repetida (o permutada) o tramo cifrado compartido: se regenera aquí,
+            # en orden de id, para que el resultado no dependa del reparto entre procesos
+            i = p["id"]
+            for intento in range(1, MAX_INTENTOS + 1):
+                with perfil.etapa("genera_paquetes.unicidad"):
+                    conflictos = indice.revisar(i, p["K"], p["cadena_cifrada"])
+                if not conflictos:
+                    break
+                perfil.contar("genera_paquetes.regeneraciones")
+                indice.registrar_colisiones(conflictos, regenerado=True)
+                p = paquete_alumno(i, p["frase_original"], p["tipo"], semilla, intento, variante)
+            else:
+                indice.registrar_colisiones(indice.revisar(i, p["K"], p["cadena_cifrada"]), regenerado=False)
+            indice.agregar(i, p["K"], p["cadena_cifrada"])
+        yield p
+
+def version_alumno(p):
     # Versión reducida (alumno)
-    paquetes_alumnos.append({
-        "id": i,
-        "K": K,
-        "cadena_cifrada": cipher
-    })
+    return {"id": p["id"], "K": p["K"], "cadena_cifrada": p["cadena_cifrada"]}
+
+def main(semilla=SEMILLA, trabajos=TRABAJOS, variante=VARIANTE, ruta_frases=RUTA_FRASES,
+         salida_docente=SALIDA_DOCENTE, salida_alumnos=SALIDA_ALUMNOS):
+    with perfil.etapa("genera_paquetes.corpus"):
+        corpus = cargar_corpus(ruta_frases)
+        revisar_corpus(corpus, variante)
+    frases, tipos = corpus.textos, corpus.tipos
+    print(f"Se cargaron {len(frases)} frases (longitud promedio: {sum(len(f) for f in frases)/len(frases):.1f} caracteres).")
+
+    # Ambos archivos se escriben en streaming (JSON Lines + índice por id)
+    indice = IndiceUnicidad()
+    with perfil.etapa("genera_paquetes.generar_y_escribir"):
+        with EscritorJsonl(salida_docente) as docente, EscritorJsonl(salida_alumnos) as alumnos:
+            for p in generar_paquetes(frases, tipos, indice, semilla, trabajos, variante):
+                docente.escribir(p)
+                alumnos.escribir(version_alumno(p))
 
-    # Mostrar solo las primeras 3
-    if i <= 3:
-        print(f"\nAlumno {i:03d} ({tipo})")
-        print("Longitud frase:", len(frase))
-        print("Matriz K:\n", pretty_matrix(K))
-        print("Primeros 15 números cifrados:", cipher[:15])
+                # Mostrar solo las primeras 3
+                if p["id"] <= 3:
+                    print(f"\nAlumno {p['id']:03d} ({p['tipo']})")
+                    print("Longitud frase:", p["longitud"])
+                    print("Matriz K:\n", VARIANTES[variante].pretty_matrix(p["K"]))
+                    print("Primeros 15 números cifrados:", p["cadena_cifrada"][:15])
 
-# Guardar ambos archivos
-with open(SALIDA_DOCENTE, "w", encoding="utf-8") as f:
-    json.dump(paquetes_docente, f, ensure_ascii=False, indent=2)
+    print("\n" + indice.reporte())
+    print(f"\n✅ Archivos generados:\n  - {salida_docente} (docente)\n  - {salida_alumnos} (alumnos)")
 
-with open(SALIDA_ALUMNOS, "w", encoding="utf-8") as f:
-    json.dump(paquetes_alumnos, f, ensure_ascii=False, indent=2)
 
-print(f"\n✅ Archivos generados:\n  - {SALIDA_DOCENTE} (docente)\n  - {SALIDA_ALUMNOS} (alumnos)")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
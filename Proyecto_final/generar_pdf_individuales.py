@@ -3,10 +3,12 @@
 # Genera un PDF por alumno con instrucciones, ejemplo y su proyecto cifrado.
 # ======================================================
 
-from pylatex import Document, Command, NoEscape
-import json, os
-import unicodedata
-import re
+import os
+from functools import lru_cache
+
+from paquetes_io import iterar_paquetes
+from compilar_pdfs import compilar_lote, comando_con_formato, generar_formato, resumen_reporte
+import instrumentacion as perfil
 
 os.environ["LANG"] = "en_US.UTF-8"
 os.environ["LC_ALL"] = "en_US.UTF-8"
@@ -14,20 +16,12 @@ os.environ["LC_ALL"] = "en_US.UTF-8"
 # ----------------------------------------
 # CONFIGURACIÓN DE RUTAS
 # ----------------------------------------
-RUTA_JSON = "frases/paquetes_300_docente.json"
+RUTA_JSON = "frases/paquetes_300_docente.jsonl"
 RUTA_INSTRUCCIONES = "instrucciones_y_ejemplo.tex"
 CARPETA_SALIDA = "Proyecto_final_individual/pdfs_alumnos"
-
-os.makedirs(CARPETA_SALIDA, exist_ok=True)
-
-# ----------------------------------------
-# LECTURA DE ARCHIVOS
-# ----------------------------------------
-with open(RUTA_JSON, "r", encoding="utf-8") as f:
-    paquetes = json.load(f)
-
-with open(RUTA_INSTRUCCIONES, "r", encoding="utf-8") as f:
-    instrucciones_y_ejemplo = f.read()
+TRABAJOS = None  # procesos de compilación (None = todos los núcleos)
+USAR_FORMATO = False  # True: vuelca el preámbulo común a un .fmt (mylatexformat) y lo reutiliza
+NOMBRE_FORMATO = "preambulo_proyecto"
 
 # ----------------------------------------
 # FUNCIÓN PARA FORMATEAR MATRICES Y CADENAS
@@ -45,38 +39,6 @@ def formatear_cadena(cifrado, por_linea=12):
         filas.append(chunk)
     return "\n".join(filas)
 
-def limpiar_texto(s):
-    return s.replace("–", "-").replace("—", "-")
-
-
-
-def limpiar_latex(s):
-    """
-    Limpia texto para evitar errores de compilación en LaTeX.
-    - Elimina acentos y caracteres no ASCII
-    - Escapa símbolos reservados: _, %, &, #, {, }, $
-    - Sustituye guiones y comillas
-    """
-    import unicodedata, re
-    if not isinstance(s, str):
-        return ""
-
-    # Normaliza acentos
-    s = unicodedata.normalize("NFKD", s)
-    s = s.encode("ascii", "ignore").decode()
-
-    # Sustituye comillas y guiones largos
-    s = s.replace("“", "\"").replace("”", "\"").replace("–", "-").replace("—", "-")
-
-    # Escapa caracteres reservados de LaTeX
-    for c in ["_", "%", "&", "#", "{", "}", "$"]:
-        s = s.replace(c, f"\\{c}")
-
-    # Quita caracteres fuera de rango ASCII o invisibles
-    s = re.sub(r"[^\x20-\x7E]", "", s)
-
-    return s.strip()
-
 # ----------------------------------------
 # GENERADOR DE BLOQUE DEL PROYECTO
 # ----------------------------------------
@@ -116,58 +78,113 @@ $\begin{{array}}{{lllllllllllllll}}
 """
 
 # ----------------------------------------
-# GENERACIÓN DE LOS PDF INDIVIDUALES
+# DOCUMENTO POR ALUMNO
 # ----------------------------------------
+FIN_DEL_FORMATO = "\\csname endofdump\\endcsname%\n"
+
+# Preámbulo común (el mismo texto que producía pylatex con Document.dumps())
+PREAMBULO = r"""\documentclass{article}%
+\usepackage[T1]{fontenc}%
+\usepackage[utf8]{inputenc}%
+\usepackage{lmodern}%
+\usepackage{textcomp}%
+\usepackage{lastpage}%
+\usepackage[a4paper, margin=2.5cm, headheight=16pt]{geometry}%
+\usepackage[spanish,es-noshorthands]{babel}%
+\usepackage[T1]{fontenc}%
+\usepackage{amsmath, amssymb, setspace, fancyhdr}%
+%
+\renewcommand\normalsize{\fontsize{12}{14}\selectfont}%
+\normalsize%
+\pagestyle{fancy}%
+\fancyhf{}%
+\lhead{Facultad de Ingeniería Tampico – UAT}%
+\rhead{Proyecto Final de Álgebra Lineal}%
+\setlength{\headheight}{16pt}%
+"""
+
+def macro_instrucciones(instrucciones_y_ejemplo):
+    return r"\newcommand{\InstruccionesYEjemplo}{" + instrucciones_y_ejemplo + "}%\n"
 
-for p in paquetes:
-    p["frase_original"] = limpiar_latex(p.get("frase_original", ""))
-    nombre_pdf = os.path.join(CARPETA_SALIDA, f"Proyecto_{p['id']:03d}")
-    doc = Document(nombre_pdf, documentclass="article")
-
-    # ====== Configuración de márgenes ======
-    doc.packages.append(NoEscape(r"\usepackage[a4paper, margin=2.5cm, headheight=16pt]{geometry}"))
-
-    # ====== Tamaño de fuente ======
-    doc.preamble.append(NoEscape(r"\renewcommand\normalsize{\fontsize{12}{14}\selectfont}"))
-    doc.preamble.append(NoEscape(r"\normalsize"))
-    doc.packages.append(NoEscape(r"\usepackage[spanish,es-noshorthands]{babel}"))
-    doc.packages.append(NoEscape(r"\usepackage[T1]{fontenc}"))
-    doc.packages.append(NoEscape(r"\usepackage{amsmath, amssymb, setspace, fancyhdr}"))
-    doc.preamble.append(Command("pagestyle", "fancy"))
-    doc.preamble.append(NoEscape(r"\fancyhf{}"))
-    doc.preamble.append(NoEscape(r"\lhead{Facultad de Ingeniería Tampico – UAT}"))
-    doc.preamble.append(NoEscape(r"\rhead{Proyecto Final de Álgebra Lineal}"))
-    doc.preamble.append(NoEscape(r"\setlength{\headheight}{16pt}"))
-
-    # Agregar instrucciones y ejemplo
-    doc.append(NoEscape(instrucciones_y_ejemplo))
-
-    # Agregar bloque del proyecto del alumno
-    doc.append(NoEscape(bloque_proyecto_tex(p)))
-
-    # Generar PDF individual
-    # Guardar .tex manualmente en UTF-8 antes de compilar
-    with open(nombre_pdf + ".tex", "w", encoding="utf-8") as tex_out:
-        tex_out.write(doc.dumps())  # dump genera todo el código LaTeX del documento
+@lru_cache(maxsize=8)
+def plantilla_documento(instrucciones_y_ejemplo, usar_formato=False):
+    """(inicio, fin) del documento; el .tex de cada alumno es inicio + bloque + fin.
 
+    Con usar_formato=True las instrucciones se guardan en la macro
+    \\InstruccionesYEjemplo dentro del preámbulo, para que queden en el formato
+    precompilado y no se vuelvan a leer en cada PDF.
+    """
+    if usar_formato:
+        inicio = (PREAMBULO + macro_instrucciones(instrucciones_y_ejemplo) + "%\n" + FIN_DEL_FORMATO
+                  + "\\begin{document}%\n\\normalsize%\n\\InstruccionesYEjemplo%\n")
+    else:
+        inicio = PREAMBULO + "%\n\\begin{document}%\n\\normalsize%\n" + instrucciones_y_ejemplo + "%\n"
+    return inicio, "%\n\\end{document}"
+
+def documento_alumno(p, instrucciones_y_ejemplo, usar_formato=False):
+    """Devuelve el código LaTeX completo del PDF individual del alumno."""
+    inicio, fin = plantilla_documento(instrucciones_y_ejemplo, usar_formato)
+    return "".join((inicio, bloque_proyecto_tex(p), fin))
+
+def fuente_formato(instrucciones_y_ejemplo):
+    """Archivo mínimo con el preámbulo común, del que se vuelca el formato."""
+    return (PREAMBULO + macro_instrucciones(instrucciones_y_ejemplo) + "%\n"
+            + FIN_DEL_FORMATO + "\\begin{document}\n\\end{document}\n")
+
+BUFER = 1 << 16  # bytes por escritura
+
+def escribir_si_cambio(ruta, contenido):
+    """Escribe el archivo solo si su contenido cambió (conserva fecha y hash).
+
+    Se compara primero el tamaño y solo si coincide se leen los bytes; la
+    escritura es una sola llamada con búfer grande.
+    """
+    datos = contenido.encode("utf-8")
     try:
-        doc.generate_pdf(nombre_pdf, clean_tex=False)
-        print(f"✅ Se genero {nombre_pdf} en: {CARPETA_SALIDA}/")
-    except Exception as e:
-        print(f"⚠️ Error al generar {nombre_pdf}.tex")
-
-        # Intentamos decodificar de varias maneras
-        salida = None
-        if hasattr(e, "output") and e.output:
-            for codec in ("utf-8", "latin-1", "cp1252"):
-                try:
-                    salida = e.output.decode(codec, errors="ignore")
-                    break
-                except Exception:
-                    continue
-        if salida:
-            print(salida[:500])  # imprime solo el inicio del log
-        else:
-            print("No se pudo decodificar la salida del compilador (probablemente AppleRoman).")
-
-print(f"✅ Se generaron {len(paquetes)} PDFs individuales en: {CARPETA_SALIDA}/")
\ No newline at end of file
+        if os.path.getsize(ruta) == len(datos):
+            with open(ruta, "rb") as f:
+                if f.read() == datos:
+                    return False
+    except FileNotFoundError:
+        pass
+    with open(ruta, "wb", buffering=BUFER) as f:
+        f.write(datos)
+    perfil.contar("bytes.tex", len(datos))
+    return True
+
+# ----------------------------------------
+# GENERACIÓN DE LOS PDF INDIVIDUALES
+# ----------------------------------------
+def main(usar_formato=USAR_FORMATO, ruta_json=RUTA_JSON, carpeta_salida=CARPETA_SALIDA,
+         ruta_instrucciones=RUTA_INSTRUCCIONES, trabajos=TRABAJOS):
+    os.makedirs(carpeta_salida, exist_ok=True)
+
+    with open(ruta_instrucciones, "r", encoding="utf-8") as f:
+        instrucciones_y_ejemplo = f.read()
+
+    # Guardar cada .tex en UTF-8; solo se reescriben los que cambiaron
+    rutas_tex = []
+    with perfil.etapa("latex.individuales.render"):
+        for p in iterar_paquetes(ruta_json):
+            ruta_tex = os.path.join(carpeta_salida, f"Proyecto_{p['id']:03d}.tex")
+            escribir_si_cambio(ruta_tex, documento_alumno(p, instrucciones_y_ejemplo, usar_formato))
+            rutas_tex.append(ruta_tex)
+
+    # Preámbulo precompilado: se vuelca una vez y todos los alumnos lo cargan
+    comando = None
+    if usar_formato:
+        ruta_fuente = os.path.join(carpeta_salida, NOMBRE_FORMATO + ".tex")
+        escribir_si_cambio(ruta_fuente, fuente_formato(instrucciones_y_ejemplo))
+        comando = comando_con_formato(generar_formato(ruta_fuente))
+
+    # Compilar en paralelo solo los .tex cuyo hash no coincide con su PDF
+    with perfil.etapa("latex.individuales.compilar"):
+        reporte = compilar_lote(rutas_tex, trabajos=trabajos, comando=comando)
+    print(resumen_reporte(reporte))
+    print(f"✅ {len(rutas_tex)} PDFs individuales al día en: {carpeta_salida}/")
+    return reporte
+
+
+if __name__ == "__main__":
+    import sys
+    main(usar_formato=USAR_FORMATO or "--formato" in sys.argv[1:])
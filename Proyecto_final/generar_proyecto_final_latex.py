@@ -1,18 +1,15 @@
 # generar_proyecto_final_latex_v2.py
 # Proyecto Final de Álgebra Lineal con portada, introducción, instrucciones, ejemplo y formato por alumno
 
-import json
 from textwrap import wrap
-from pathlib import Path
+
+from paquetes_io import iterar_paquetes
+import instrumentacion as perfil
 
 carpeta = "frases/"
-ARCHIVO_ENTRADA = f"{carpeta}paquetes_300_alumnos.json"
+ARCHIVO_ENTRADA = f"{carpeta}paquetes_300_alumnos.jsonl"
 ARCHIVO_SALIDA = f"{carpeta}Proyecto_Final_Algebra_Lineal_v2.tex"
 
-# Leer datos
-with open(ARCHIVO_ENTRADA, "r", encoding="utf-8") as f:
-    data = json.load(f)
-
 def formatear_matriz(K):
     filas = [" & ".join(str(x) for x in fila) for fila in K]
     return "\\\\\n".join(filas)
@@ -39,6 +36,13 @@ header = r"""
 \rhead{Proyecto Final de Álgebra Lineal}
 \setlength{\headheight}{16pt} % ✅ Evita warnings de fancyhdr
 
+% Registro de páginas: cada proyecto escribe "id página" en \jobname.pags
+% (lo usa dividir_pdf.py para separar el PDF maestro por alumno)
+\newcount\paginafisica
+\AddToHook{shipout/before}{\global\advance\paginafisica by 1}
+\newwrite\paginasproyectos
+\immediate\openout\paginasproyectos=\jobname.pags
+
 \begin{document}
 
 % ==================== PORTADA ====================
@@ -121,16 +125,19 @@ que puede traducirse según la tabla alfabética para obtener el mensaje origina
 \section*{Proyectos Individuales}
 A continuación se presentan los proyectos asignados a cada estudiante.
 Cada uno cuenta con un espacio para anotar su información personal y desarrollar su descifrado.
+
+% El primer proyecto empieza en página propia: dividir_pdf.py toma como
+% portada todo lo anterior y no debe cortar ni repetir páginas.
+\clearpage
 """
 
 # ==================== BLOQUES DE PROYECTOS ====================
-bloques = []
-for alumno in data:
+def bloque_alumno(alumno):
     i = alumno["id"]
     K = alumno["K"]
     cif = alumno["cadena_cifrada"]
-
-    bloque = rf"""
+    return rf"""
+\write\paginasproyectos{{{i:03d} \the\paginafisica}}%
 \textbf{{Proyecto {i:03d}}}
 
 \textbf{{Nombre del alumno:}} \underline{{\hspace{{13cm}}}}\\\
@@ -157,9 +164,21 @@ $\begin{{array}}{{lllllllllllll}}
 
 \newpage
 """
-    bloques.append(bloque)
 
 footer = r"\end{document}"
 
-Path(ARCHIVO_SALIDA).write_text(header + "\n".join(bloques) + footer, encoding="utf-8")
-print(f"✅ Documento completo generado: {ARCHIVO_SALIDA}")
\ No newline at end of file
+def generar_documento(ruta_entrada=ARCHIVO_ENTRADA, ruta_salida=ARCHIVO_SALIDA):
+    """Escribe el documento maestro bloque por bloque, sin cargar todos los paquetes."""
+    with perfil.etapa("latex.maestro.render"), open(ruta_salida, "w", encoding="utf-8") as out:
+        out.write(header)
+        for n, alumno in enumerate(iterar_paquetes(ruta_entrada)):
+            if n:
+                out.write("\n")
+            out.write(bloque_alumno(alumno))
+        out.write(footer)
+        perfil.contar("bytes.tex", out.tell())
+
+
+if __name__ == "__main__":
+    generar_documento()
+    print(f"✅ Documento completo generado: {ARCHIVO_SALIDA}")
@@ -6,6 +6,9 @@
 import numpy as np
 import random
 
+from codec import Codec
+import instrumentacion as perfil
+
 # ------------------------------------------------------
 # 1. Mapeo de letras a números y viceversa
 # ------------------------------------------------------
@@ -14,13 +17,35 @@ alfabeto[' '] = 27
 alfabeto[','] = 28
 alfabeto['.'] = 29
 inverso = {v: k for k, v in alfabeto.items()}
+CODEC = Codec(alfabeto, lambda c: "".join(x for x in c.upper() if x in alfabeto), relleno=27)
 
 # ------------------------------------------------------
 # 2. Generar matriz llave invertible (3x3)
 # ------------------------------------------------------
-def generar_matriz_llave():
+def det_entero(K):
+    """Determinante 3x3 exacto (cofactores con enteros, sin punto flotante)."""
+    (a, b, c), (d, e, f), (g, h, i) = np.asarray(K, dtype=np.int64).tolist()
+    return a*(e*i - f*h) - b*(d*i - f*g) + c*(d*h - e*g)
+
+def generar_matriz_llave(exacto=True, rng=None):
+    """Matriz 3x3 con entradas 1..9 e invertible.
+
+    exacto=True (por defecto, igual que package_for_student): llave int64
+    verificada con determinante entero != 0.
+    exacto=False: comportamiento original (flotantes, |det| > 1e-6).
+    rng: random.Random del alumno; si es None se usa el estado global de np.random.
+    """
     while True:
-        K = np.random.randint(1, 10, (3, 3)).astype(float)
+        if rng is None:
+            K = np.random.randint(1, 10, (3, 3))
+        else:
+            K = np.array([[rng.randint(1, 9) for _ in range(3)] for _ in range(3)])
+        perfil.contar("gauss.llave.intentos")
+        if exacto:
+            if det_entero(K) != 0:
+                return K.astype(np.int64).tolist()
+            continue
+        K = K.astype(float)
         if abs(np.linalg.det(K)) > 1e-6:
             return K.round(2).tolist()
 
@@ -28,10 +53,7 @@ def generar_matriz_llave():
 # 3. Convertir texto a números
 # ------------------------------------------------------
 def frase_a_numeros(frase: str):
-    nums = []
-    for c in frase.upper():
-        if c in alfabeto:
-            nums.append(alfabeto[c])
+    nums = list(CODEC.codificar(frase))
     while len(nums) % 3 != 0:
         nums.append(27)  # relleno con espacio
     return np.array(nums)
@@ -49,12 +71,19 @@ def cifrar_frase(K, frase):
         cifrado.extend(resultado.round(2).tolist())
     return cifrado
 
+def cifrar_frase_entera(K, frase):
+    """Cifra toda la frase con un solo producto entero (L/3, 3) @ (3, 3)."""
+    K = np.asarray(K, dtype=np.int64)
+    bloques = frase_a_numeros(frase).astype(np.int64).reshape(-1, 3)
+    return (bloques @ K.T).ravel().tolist()
+
 # ------------------------------------------------------
 # 5. Paquete por estudiante (mantiene compatibilidad)
 # ------------------------------------------------------
-def package_for_student(i, frase):
-    K = generar_matriz_llave()
-    cifrado = cifrar_frase(K, frase)
+def package_for_student(i, frase, exacto=True, rng=None):
+    """(K, cifrado). Con exacto=True todo es entero; exacto=False reproduce la versión flotante."""
+    K = generar_matriz_llave(exacto, rng)
+    cifrado = cifrar_frase_entera(K, frase) if exacto else cifrar_frase(K, frase)
     return K, cifrado
 
 # ------------------------------------------------------
@@ -63,4 +92,6 @@ def package_for_student(i, frase):
 def pretty_matrix(K):
     if isinstance(K, list):
         K = np.array(K)
+    if K.dtype.kind in "iu":
+        return "\n".join(["  ".join(f"{x:5d}" for x in fila) for fila in K])
     return "\n".join(["  ".join(f"{x:5.2f}" for x in fila) for fila in K])
\ No newline at end of file
@@ -5,6 +5,11 @@
 import random
 from typing import List, Tuple
 
+import numpy as np
+
+from codec import Codec
+import instrumentacion as perfil
+
 # ---------- Mapeo ----------
 ALPHABET_FWD = {
     **{chr(ord('A') + i): i + 1 for i in range(26)},
@@ -12,22 +17,19 @@ ALPHABET_FWD = {
 }
 ALPHABET_INV = {v: k for k, v in ALPHABET_FWD.items()}
 
+ACENTOS = {'Á': 'A', 'É': 'E', 'Í': 'I', 'Ó': 'O', 'Ú': 'U', 'Ñ': 'N'}
+
+def _normalize_char(ch: str) -> str:
+    # Otros caracteres se descartan o convierten a espacio si prefieres
+    return ''.join(c if c in ALPHABET_FWD else ACENTOS.get(c, '') for c in ch.upper())
+
+CODEC = Codec(ALPHABET_FWD, _normalize_char, relleno=27)
+
 def normalize_text(s: str) -> str:
-    out = []
-    for ch in s.upper():
-        if ch in ALPHABET_FWD:
-            out.append(ch)
-        elif ch == 'Á': out.append('A')
-        elif ch == 'É': out.append('E')
-        elif ch == 'Í': out.append('I')
-        elif ch == 'Ó': out.append('O')
-        elif ch == 'Ú': out.append('U')
-        elif ch == 'Ñ': out.append('N')
-        # Otros caracteres se descartan o convierten a espacio si prefieres
-    return ''.join(out)
+    return CODEC.normalizar(s)
 
 def text_to_numbers(s: str) -> List[int]:
-    return [ALPHABET_FWD[ch] for ch in normalize_text(s)]
+    return list(CODEC.codificar(s))
 
 def numbers_to_text(nums: List[int]) -> str:
     txt = []
@@ -78,6 +80,25 @@ def inv_unimodular(M: List[List[int]]) -> List[List[int]]:
     else:  # d == -1
         return [[-x for x in row] for row in Adj]
 
+# ---------- Versiones por lotes: pilas (N, 3, 3) ----------
+def adjugate3_batch(Ms: np.ndarray) -> np.ndarray:
+    """adj(M) de cada matriz de la pila, con las fórmulas cerradas de cofactores."""
+    Ms = np.asarray(Ms, dtype=np.int64)
+    a, b, c = Ms[..., 0, 0], Ms[..., 0, 1], Ms[..., 0, 2]
+    d, e, f = Ms[..., 1, 0], Ms[..., 1, 1], Ms[..., 1, 2]
+    g, h, i = Ms[..., 2, 0], Ms[..., 2, 1], Ms[..., 2, 2]
+    return np.stack([
+        np.stack([e*i - f*h, -(b*i - c*h), b*f - c*e], axis=-1),
+        np.stack([-(d*i - f*g), a*i - c*g, -(a*f - c*d)], axis=-1),
+        np.stack([d*h - e*g, -(a*h - b*g), a*e - b*d], axis=-1),
+    ], axis=-2)
+
+def det3_batch(Ms: np.ndarray, adj: np.ndarray = None) -> np.ndarray:
+    """Determinantes exactos (N,); reutiliza adj(M) si ya se calculó (det = fila 0 · columna 0 de adj)."""
+    Ms = np.asarray(Ms, dtype=np.int64)
+    adj = adjugate3_batch(Ms) if adj is None else adj
+    return np.einsum("...j,...j->...", Ms[..., 0, :], adj[..., :, 0])
+
 def mat_vec_mul(M: List[List[int]], v: List[int]) -> List[int]:
     return [M[0][0]*v[0] + M[0][1]*v[1] + M[0][2]*v[2],
             M[1][0]*v[0] + M[1][1]*v[1] + M[1][2]*v[2],
@@ -91,12 +112,56 @@ def pretty_matrix(M: List[List[int]]) -> str:
     return "\n".join("".join(f"{x:6d}" for x in row) for row in M)
 
 # ---------- Generación de K ----------
-def random_unimodular_matrix(max_abs: int = 5) -> List[List[int]]:
-    for _ in range(100000):  # límite alto por seguridad
-        K = [[random.randint(-max_abs, max_abs) for _ in range(3)] for _ in range(3)]
-        if det3(K) in (1, -1):
-            return K
-    raise RuntimeError("No se encontró una matriz unimodular en el rango dado.")
+def random_unimodular_matrix(max_abs: int = 5, pasos: int = 40, rng=random) -> List[List[int]]:
+    """Construye directamente una matriz entera con det = ±1 y |entradas| <= max_abs.
+
+    Parte de una diagonal de ±1 y aplica `pasos` operaciones elementales enteras
+    (fila_i += k·fila_j o columna_i += k·columna_j, k en ±1, ±2); cada operación
+    conserva el determinante y solo se acepta si no rebasa la cota. Al final se
+    permutan las filas. No hay muestreo por rechazo: el costo es fijo por llave.
+    `rng` puede ser el módulo `random` o una instancia de `random.Random`.
+    """
+    if max_abs < 1:
+        raise ValueError("max_abs debe ser al menos 1.")
+    K = [[rng.choice((-1, 1)) if r == c else 0 for c in range(3)] for r in range(3)]
+    rechazadas = 0
+    for _ in range(pasos):
+        i, j = rng.sample(range(3), 2)
+        k = rng.choice((-2, -1, 1, 2))
+        if rng.random() < 0.5:
+            fila = [a + k*b for a, b in zip(K[i], K[j])]
+            if max(map(abs, fila)) <= max_abs:
+                K[i] = fila
+            else:
+                rechazadas += 1
+        else:
+            col = [K[r][i] + k*K[r][j] for r in range(3)]
+            if max(map(abs, col)) <= max_abs:
+                for r in range(3):
+                    K[r][i] = col[r]
+            else:
+                rechazadas += 1
+    perfil.contar("enteros.llave.operaciones", pasos)
+    perfil.contar("enteros.llave.operaciones_rechazadas", rechazadas)
+    rng.shuffle(K)
+    return K
+
+# ---------- Catálogo precalculado (catalogo_unimodular.py) ----------
+CATALOGO = None     # Catalogo en disco; si está cargado, las llaves salen de ahí
+DIFICULTAD = None   # nivel por defecto: "facil", "media", "dificil" o None (cualquiera)
+
+def usar_catalogo(ruta, dificultad=None):
+    """Carga el catálogo (memoria mapeada) para que package_for_student sortee de él en O(1)."""
+    global CATALOGO, DIFICULTAD
+    from catalogo_unimodular import Catalogo
+    CATALOGO = Catalogo(ruta) if ruta else None
+    DIFICULTAD = dificultad
+    return CATALOGO
+
+def llave_del_catalogo(rng=random, dificultad=None) -> List[List[int]]:
+    if CATALOGO is None:
+        raise ValueError("No hay catálogo cargado: llama antes a usar_catalogo(ruta).")
+    return CATALOGO.matriz(CATALOGO.sortear(rng, dificultad or DIFICULTAD))
 
 # ---------- Bloques y cifrado ----------
 def chunk3(nums: List[int], pad: int = 27) -> List[List[int]]:
@@ -120,9 +185,18 @@ def decrypt(K: List[List[int]], cipher: List[int]) -> List[int]:
     return flatten(dec_blocks)
 
 # ---------- API para tu generador ----------
-def package_for_student(i: int, frase: str) -> Tuple[List[List[int]], List[int]]:
-    """Genera (K, cadena_cifrada) dados id y frase."""
-    K = random_unimodular_matrix(max_abs=5)
+def package_for_student(i: int, frase: str, rng=random, dificultad=None) -> Tuple[List[List[int]], List[int]]:
+    """Genera (K, cadena_cifrada) dados id y frase (rng: flujo aleatorio del alumno).
+
+    Con un catálogo cargado la llave se sortea del nivel `dificultad`; si no,
+    se construye con random_unimodular_matrix.
+    """
+    if CATALOGO is not None:
+        K = llave_del_catalogo(rng, dificultad)
+    elif dificultad is not None:
+        raise ValueError("La dificultad requiere un catálogo (usar_catalogo).")
+    else:
+        K = random_unimodular_matrix(max_abs=5, rng=rng)
     nums = text_to_numbers(frase)
     cipher = encrypt(K, nums)
     # (opcional) verificación de vuelta:
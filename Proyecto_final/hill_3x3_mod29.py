@@ -4,8 +4,14 @@
 # Alfabeto (m=29): A=0,...,N=13, Ñ=14, O=15,...,Z=26, " " (espacio)=27, "."=28
 
 import random
-import unicodedata
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from codec import Codec, sin_acentos
+from hill_3x3_gauss_enteros import adjugate3_batch, det3_batch
+import instrumentacion as perfil
 
 M = 29  # módulo primo
 SYMS = "ABCDEFGHIJKLMNOPQRSTUVWXYZÑ ."
@@ -14,21 +20,23 @@ SYMS = "ABCDEFGHIJKLMNOPQRSTUVWXYZÑ ."
 char2num = {ch: i for i, ch in enumerate(SYMS)}
 num2char = {i: ch for i, ch in enumerate(SYMS)}
 
+def _normalize_char(ch: str) -> str:
+    if ch in "Ññ":
+        return "Ñ"
+    out = sin_acentos(ch).upper()
+    for c in out:
+        if c not in SYMS:
+            raise ValueError(f"Carácter no permitido: {repr(c)}")
+    return out
+
+CODEC = Codec(char2num, _normalize_char, relleno=char2num[" "])
+
 def normalize_keep_enye(s: str) -> str:
     """Quita acentos, conserva Ñ/ñ y mayusculiza; elimina caracteres no permitidos."""
-    s = s.replace("Ñ", "__ENYE__").replace("ñ", "__ENYE__")
-    s = unicodedata.normalize("NFD", s)
-    s = "".join(ch for ch in s if unicodedata.category(ch) != "Mn")
-    s = s.upper().replace("__ENYE__", "Ñ")
-    # Validación de caracteres
-    for ch in s:
-        if ch not in SYMS:
-            raise ValueError(f"Carácter no permitido: {repr(ch)}")
-    return s
+    return CODEC.normalizar(s)
 
 def text_to_numbers(text: str) -> List[int]:
-    text = normalize_keep_enye(text)
-    return [char2num[ch] for ch in text]
+    return list(CODEC.codificar(text))
 
 def numbers_to_text(nums: List[int]) -> str:
     return "".join(num2char[(n % M)] for n in nums)
@@ -89,12 +97,52 @@ def mat_inv_mod(A: List[List[int]], m: int = M) -> List[List[int]]:
     adj = mat_adj_mod(A, m)
     return [[(det_inv * adj[i][j]) % m for j in range(3)] for i in range(3)]
 
-def random_invertible_matrix_3x3(m: int = M) -> List[List[int]]:
+def random_invertible_matrix_3x3(m: int = M, rng=random) -> List[List[int]]:
     while True:
-        A = [[random.randrange(m) for _ in range(3)] for _ in range(3)]
+        A = [[rng.randrange(m) for _ in range(3)] for _ in range(3)]
+        perfil.contar("mod29.llave.intentos")
         if mat_det_mod(A, m) % m != 0:
             return A
 
+def random_invertible_matrices_3x3(n: int, m: int = M, rng: np.random.Generator = None) -> np.ndarray:
+    """Genera n matrices 3x3 invertibles mod m de golpe, como arreglo (n, 3, 3) int64.
+
+    Se sortean todas a la vez y solo se vuelven a sortear las singulares
+    (≈3.5% para m=29), así que el costo esperado es constante por llave.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    Ks = rng.integers(0, m, size=(n, 3, 3), dtype=np.int64)
+    pendientes = np.flatnonzero(mat_det_mod_batch(Ks, m) == 0)
+    perfil.contar("mod29.llaves_lote.intentos", n)
+    while pendientes.size:
+        perfil.contar("mod29.llaves_lote.intentos", pendientes.size)
+        Ks[pendientes] = rng.integers(0, m, size=(pendientes.size, 3, 3), dtype=np.int64)
+        pendientes = pendientes[mat_det_mod_batch(Ks[pendientes], m) == 0]
+    return Ks
+
+# ---------- Versiones por lotes: pilas (N, 3, 3) ----------
+@lru_cache(maxsize=None)
+def inv_table(m: int = M) -> np.ndarray:
+    """Tabla de inversos mod m (m primo): inv_table(m)[a] = a⁻¹; la entrada 0 queda en 0."""
+    tabla = np.zeros(m, dtype=np.int64)
+    tabla[1:] = [pow(a, m-2, m) for a in range(1, m)]
+    return tabla
+
+def mat_adj_mod_batch(As: np.ndarray, m: int = M) -> np.ndarray:
+    """adj(A) mod m de cada matriz de la pila (cofactores cerrados, sin ciclo sobre N)."""
+    return adjugate3_batch(As) % m
+
+def mat_det_mod_batch(As: np.ndarray, m: int = M) -> np.ndarray:
+    return det3_batch(As) % m
+
+def mat_inv_mod_batch(As: np.ndarray, m: int = M) -> np.ndarray:
+    """Inversas mod m de toda la pila: det⁻¹ (de la tabla) · adj(A) mod m."""
+    det = mat_det_mod_batch(As, m)
+    if np.any(det == 0):
+        malas = np.flatnonzero(det == 0)
+        raise ValueError(f"Matrices no invertibles mod m en las posiciones {malas[:10].tolist()}.")
+    return (inv_table(m)[det][..., None, None] * mat_adj_mod_batch(As, m)) % m
+
 def verify_inverse(A: List[List[int]], Ainv: List[List[int]], m: int = M) -> bool:
     I = mat_mul_mod(A, Ainv, m)
     # verificar identidad
@@ -117,10 +165,45 @@ def decrypt_with_key(K: List[List[int]], cipher_nums: List[int]) -> str:
         plain.extend(out)
     return numbers_to_text(plain)
 
-def package_for_student(student_id: int, phrase: str):
+# ---------- Cifrado por lotes (toda la cohorte en un solo producto) ----------
+def texts_to_array(texts: Sequence[str], length: int = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Convierte N frases en un arreglo (N, L) int64 rellenado con espacio (27).
+
+    L es la longitud máxima redondeada a múltiplo de 3 (o `length`, si se da;
+    ValueError si es menor que la frase más larga). Devuelve también las
+    longitudes originales de cada frase.
+    """
+    return CODEC.corpus_a_arreglo(texts, longitud=length)
+
+def encrypt_batch(Ks: np.ndarray, msgs: np.ndarray, m: int = M) -> np.ndarray:
+    """Cifra N mensajes (N, L) con N llaves (N, 3, 3) en un solo einsum mod m.
+
+    Equivale a aplicar `encrypt_with_key` a cada par (K, mensaje) ya rellenado.
+    """
+    Ks = np.asarray(Ks, dtype=np.int64)
+    msgs = np.asarray(msgs, dtype=np.int64)
+    N, L = msgs.shape
+    if L % 3 != 0:
+        raise ValueError("La longitud de los mensajes debe ser múltiplo de 3.")
+    blocks = msgs.reshape(N, L // 3, 3)
+    out = np.einsum("nij,nbj->nbi", Ks, blocks) % m
+    return out.reshape(N, L)
+
+def decrypt_batch(Ks: np.ndarray, ciphers: np.ndarray, m: int = M) -> np.ndarray:
+    """Descifra N cadenas (N, L) invirtiendo cada llave mod m y aplicando encrypt_batch."""
+    return encrypt_batch(mat_inv_mod_batch(Ks, m), ciphers, m)
+
+def array_to_texts(nums: np.ndarray, lengths: Sequence[int] = None) -> List[str]:
+    """Inversa de texts_to_array: (N, L) -> N frases (recortadas a `lengths` si se da)."""
+    texts = [numbers_to_text(row) for row in np.asarray(nums).tolist()]
+    if lengths is not None:
+        texts = [t[:n] for t, n in zip(texts, lengths)]
+    return texts
+
+def package_for_student(student_id: int, phrase: str, rng=random):
     if (len(phrase) % 3) != 0 or not (90 <= len(phrase) <= 110):
         raise ValueError("La frase debe ser multiplo de 3 y ~100 caracteres.")
-    K = random_invertible_matrix_3x3(M)
+    K = random_invertible_matrix_3x3(M, rng)
     cipher = encrypt_with_key(K, phrase)
     return K, cipher
 
@@ -0,0 +1,200 @@
+# ======================================================
+# Archivo: hill_nxn.py
+# Motor Hill general: llaves n×n (2 <= n <= 8) y módulo configurable.
+# El álgebra exacta (determinante y adjunta) se hace con eliminación de
+# Bareiss sin fracciones sobre enteros de Python; el cifrado se hace con
+# productos de matrices por bloques en NumPy, sin ciclos por bloque.
+#
+# modulo=None  -> variante entera (llaves unimodulares, det = ±1, sin reducción)
+# modulo=m     -> variante modular (llaves con mcd(det, m) = 1; m no tiene que ser primo)
+# ======================================================
+
+import random
+from math import gcd
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+import hill_3x3_mod29 as mod29
+import instrumentacion as perfil
+
+TAM_MIN, TAM_MAX = 2, 8
+M = mod29.M
+CODEC = mod29.CODEC  # alfabeto de 29 símbolos (A=0 .. "."=28)
+
+def _revisar_tam(n: int):
+    if not (TAM_MIN <= n <= TAM_MAX):
+        raise ValueError(f"El tamaño de la llave debe estar entre {TAM_MIN} y {TAM_MAX}.")
+
+def _enteros(A) -> List[List[int]]:
+    return [[int(x) for x in fila] for fila in A]
+
+# ---------- Álgebra exacta (Bareiss) ----------
+def det_bareiss(A) -> int:
+    """Determinante exacto por eliminación de Bareiss (todas las divisiones son exactas)."""
+    M_ = _enteros(A)
+    n = len(M_)
+    signo, previo = 1, 1
+    for k in range(n - 1):
+        if M_[k][k] == 0:
+            fila = next((r for r in range(k + 1, n) if M_[r][k] != 0), None)
+            if fila is None:
+                return 0
+            M_[k], M_[fila] = M_[fila], M_[k]
+            signo = -signo
+        for i in range(k + 1, n):
+            for j in range(k + 1, n):
+                M_[i][j] = (M_[i][j] * M_[k][k] - M_[i][k] * M_[k][j]) // previo
+        previo = M_[k][k]
+    return signo * M_[n - 1][n - 1]
+
+def det_y_adjunta(A) -> Tuple[int, List[List[int]]]:
+    """(det(A), adj(A)) exactos con Gauss–Jordan sin fracciones sobre [A | I].
+
+    Al terminar, el bloque izquierdo es d·I y el derecho es d·A⁻¹, donde d es
+    el determinante de A con las filas intercambiadas; con el signo de los
+    intercambios se recupera det(A) y adj(A) = det(A)·A⁻¹.
+    Lanza ValueError si A es singular (no es invertible con ningún módulo).
+    """
+    n = len(A)
+    M_ = [fila + [int(r == c) for c in range(n)] for r, fila in enumerate(_enteros(A))]
+    signo, previo = 1, 1
+    for k in range(n):
+        if M_[k][k] == 0:
+            fila = next((r for r in range(k + 1, n) if M_[r][k] != 0), None)
+            if fila is None:
+                raise ValueError("Matriz singular: no tiene inversa.")
+            M_[k], M_[fila] = M_[fila], M_[k]
+            signo = -signo
+        pivote = M_[k][k]
+        for i in range(n):
+            if i == k:
+                continue
+            factor = M_[i][k]
+            M_[i] = [(pivote * x - factor * y) // previo for x, y in zip(M_[i], M_[k])]
+        previo = pivote
+    d = M_[n - 1][n - 1]
+    adj = [[signo * x for x in fila[n:]] for fila in M_]
+    return signo * d, adj
+
+def inversa_mod(A, m: int = M) -> List[List[int]]:
+    """A⁻¹ mod m = det⁻¹·adj(A) mod m; existe si y solo si mcd(det, m) = 1."""
+    det, adj = det_y_adjunta(A)
+    if gcd(det % m, m) != 1:
+        raise ValueError(f"Matriz no invertible mod {m} (mcd(det, m) ≠ 1).")
+    det_inv = pow(det, -1, m)
+    return [[(det_inv * x) % m for x in fila] for fila in adj]
+
+def inversa_entera(A) -> List[List[int]]:
+    """Inversa exacta de una matriz unimodular (det = ±1): det·adj(A)."""
+    det, adj = det_y_adjunta(A)
+    if det not in (1, -1):
+        raise ValueError("La matriz no es unimodular (det ≠ ±1).")
+    return [[det * x for x in fila] for fila in adj]
+
+def inversa(A, modulo=M) -> List[List[int]]:
+    return inversa_entera(A) if modulo is None else inversa_mod(A, modulo)
+
+# ---------- Generación de llaves ----------
+def matriz_invertible_mod(n: int, m: int = M, rng=random) -> List[List[int]]:
+    """Llave n×n con entradas 0..m-1 y mcd(det, m) = 1 (muestreo por rechazo)."""
+    _revisar_tam(n)
+    while True:
+        A = [[rng.randrange(m) for _ in range(n)] for _ in range(n)]
+        perfil.contar(f"nxn.llave{n}.intentos")
+        if gcd(det_bareiss(A) % m, m) == 1:
+            return A
+
+def matriz_unimodular(n: int, max_abs: int = 5, pasos: int = None, rng=random) -> List[List[int]]:
+    """Matriz entera n×n con det = ±1 y |entradas| <= max_abs, por construcción.
+
+    Igual que `hill_3x3_gauss_enteros.random_unimodular_matrix`: diagonal de ±1,
+    operaciones elementales acotadas (k en ±1, ±2) y permutación final de filas.
+    """
+    _revisar_tam(n)
+    if max_abs < 1:
+        raise ValueError("max_abs debe ser al menos 1.")
+    pasos = 12 * n if pasos is None else pasos
+    K = [[rng.choice((-1, 1)) if r == c else 0 for c in range(n)] for r in range(n)]
+    for _ in range(pasos):
+        i, j = rng.sample(range(n), 2)
+        k = rng.choice((-2, -1, 1, 2))
+        if rng.random() < 0.5:
+            fila = [a + k*b for a, b in zip(K[i], K[j])]
+            if max(map(abs, fila)) <= max_abs:
+                K[i] = fila
+        else:
+            col = [K[r][i] + k*K[r][j] for r in range(n)]
+            if max(map(abs, col)) <= max_abs:
+                for r in range(n):
+                    K[r][i] = col[r]
+    rng.shuffle(K)
+    return K
+
+def generar_llave(n: int, modulo=M, rng=random) -> List[List[int]]:
+    return matriz_unimodular(n, rng=rng) if modulo is None else matriz_invertible_mod(n, modulo, rng)
+
+# ---------- Cifrado por bloques (NumPy) ----------
+def texto_a_arreglo(texto: str, n: int, codec=CODEC) -> np.ndarray:
+    """Frase -> números del alfabeto, rellenada con `codec.relleno` hasta múltiplo de n."""
+    nums = codec.a_arreglo(texto)
+    return np.concatenate([nums, np.full((-len(nums)) % n, codec.relleno, dtype=np.int64)])
+
+def aplicar_llave(K, nums, modulo=M) -> np.ndarray:
+    """Todos los bloques de una cadena a la vez: (L/n, n) @ Kᵀ (mod m si hay módulo)."""
+    K = np.asarray(K, dtype=np.int64)
+    n = K.shape[0]
+    nums = np.asarray(nums, dtype=np.int64)
+    if nums.size % n != 0:
+        raise ValueError(f"La longitud de la cadena debe ser múltiplo de {n}.")
+    out = (nums.reshape(-1, n) @ K.T).reshape(-1)
+    return out if modulo is None else out % modulo
+
+def cifrar(K, texto: str, modulo=M, codec=CODEC) -> List[int]:
+    return aplicar_llave(K, texto_a_arreglo(texto, len(K), codec), modulo).tolist()
+
+def descifrar(K, cifrado: Sequence[int], modulo=M, codec=CODEC) -> str:
+    return codec.decodificar(aplicar_llave(inversa(K, modulo), cifrado, modulo).tolist())
+
+def aplicar_llaves_lote(Ks, msgs, modulo=M) -> np.ndarray:
+    """N cadenas (N, L) con N llaves (N, n, n) en un solo einsum."""
+    Ks = np.asarray(Ks, dtype=np.int64)
+    msgs = np.asarray(msgs, dtype=np.int64)
+    N, L = msgs.shape
+    n = Ks.shape[-1]
+    if L % n != 0:
+        raise ValueError(f"La longitud de los mensajes debe ser múltiplo de {n}.")
+    out = np.einsum("nij,nbj->nbi", Ks, msgs.reshape(N, L // n, n)).reshape(N, L)
+    return out if modulo is None else out % modulo
+
+def cifrar_lote(Ks, textos: Sequence[str], modulo=M, codec=CODEC) -> Tuple[np.ndarray, np.ndarray]:
+    """Cifra N frases con N llaves n×n; devuelve (cifrado (N, L), longitudes)."""
+    n = np.asarray(Ks).shape[-1]
+    msgs, longitudes = codec.corpus_a_arreglo(textos, multiplo=n)
+    return aplicar_llaves_lote(Ks, msgs, modulo), longitudes
+
+def descifrar_lote(Ks, cifrados, modulo=M) -> np.ndarray:
+    """Invierte cada llave (exacto, Bareiss) y descifra todas las cadenas en un einsum."""
+    inversas = np.array([inversa(K, modulo) for K in np.asarray(Ks).tolist()], dtype=np.int64)
+    return aplicar_llaves_lote(inversas, cifrados, modulo)
+
+# ---------- API para el generador de paquetes ----------
+def package_for_student(i: int, frase: str, n: int = 4, modulo=M, rng=random, codec=CODEC):
+    """(K, cadena_cifrada) con llave n×n; modulo=None usa la variante entera unimodular."""
+    if modulo is not None and max(codec.simbolos.values()) >= modulo:
+        raise ValueError("El módulo debe ser mayor que todos los números del alfabeto.")
+    K = generar_llave(n, modulo, rng)
+    return K, cifrar(K, frase, modulo, codec)
+
+def pretty_matrix(A) -> str:
+    return "\n".join("".join(f"{x:6d}" for x in fila) for fila in A)
+
+if __name__ == "__main__":
+    random.seed(2025)
+    demo = "LA PRACTICA HACE AL MAESTRO."
+    for n, modulo in ((2, 29), (4, 29), (5, 31), (8, None)):
+        K, c = package_for_student(1, demo, n, modulo)
+        print(f"n={n} módulo={modulo}  det={det_bareiss(K)}")
+        print(pretty_matrix(K))
+        print("Cifrado (primeros 12):", c[:12])
+        print("¿Recupera?", descifrar(K, c, modulo)[:len(demo)] == demo, "\n")
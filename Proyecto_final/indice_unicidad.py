@@ -0,0 +1,84 @@
+# ======================================================
+# Archivo: indice_unicidad.py
+# Índice hash de llaves canónicas y de corridas de bloques cifrados, para
+# detectar en O(1) por paquete llaves repetidas (o que solo difieren por una
+# permutación de filas/columnas) y cadenas cifradas que comparten tramos largos.
+# ======================================================
+
+from itertools import permutations
+
+PERMS_3 = list(permutations(range(3)))
+BASE = 1_000_003              # base del hash rodante
+PRIMO = (1 << 61) - 1         # módulo del hash rodante
+
+def _entero(x):
+    return int(x) if float(x).is_integer() else x
+
+def clave_canonica(K):
+    """Representante de K bajo permutaciones de filas y columnas.
+
+    Para cada una de las 6 permutaciones de columnas se ordenan las filas;
+    el mínimo de esas 6 formas es igual para todas las matrices equivalentes.
+    """
+    filas = [tuple(_entero(x) for x in fila) for fila in K]
+    return min(tuple(sorted(tuple(f[c] for c in p) for f in filas)) for p in PERMS_3)
+
+def hashes_corridas(cifrado, ventana):
+    """Hash rodante (Rabin–Karp) de cada tramo de `ventana` bloques de 3 consecutivos."""
+    bloques = [hash(tuple(_entero(x) for x in cifrado[i:i+3])) % PRIMO
+               for i in range(0, len(cifrado) - 2, 3)]
+    if len(bloques) < ventana:
+        return []
+    potencia = pow(BASE, ventana - 1, PRIMO)
+    h = 0
+    for b in bloques[:ventana]:
+        h = (h * BASE + b) % PRIMO
+    salida = [h]
+    for sale, entra in zip(bloques, bloques[ventana:]):
+        h = ((h - sale * potencia) * BASE + entra) % PRIMO
+        salida.append(h)
+    return salida
+
+class IndiceUnicidad:
+    """Registra llaves y tramos cifrados ya asignados y reporta colisiones.
+
+    ventana: número de bloques de 3 que forman un "tramo largo" (4 = 12 números).
+    """
+
+    def __init__(self, ventana=4):
+        self.ventana = ventana
+        self.llaves = {}        # clave canónica -> id
+        self.corridas = {}      # hash de tramo -> id
+        self.colisiones = []    # registros para el reporte
+
+    def revisar(self, id_alumno, K, cifrado):
+        """Conflictos que tendría el paquete, sin registrarlo."""
+        conflictos = []
+        otro = self.llaves.get(clave_canonica(K))
+        if otro is not None and otro != id_alumno:
+            conflictos.append({"tipo": "llave", "id": id_alumno, "con": otro})
+        for h in hashes_corridas(cifrado, self.ventana):
+            otro = self.corridas.get(h)
+            if otro is not None and otro != id_alumno:
+                conflictos.append({"tipo": "cifrado", "id": id_alumno, "con": otro})
+                break
+        return conflictos
+
+    def agregar(self, id_alumno, K, cifrado):
+        self.llaves.setdefault(clave_canonica(K), id_alumno)
+        for h in hashes_corridas(cifrado, self.ventana):
+            self.corridas.setdefault(h, id_alumno)
+
+    def registrar_colisiones(self, conflictos, regenerado):
+        for c in conflictos:
+            self.colisiones.append({**c, "regenerado": regenerado})
+
+    def reporte(self):
+        llaves = sum(c["tipo"] == "llave" for c in self.colisiones)
+        cifrados = sum(c["tipo"] == "cifrado" for c in self.colisiones)
+        pendientes = [c for c in self.colisiones if not c["regenerado"]]
+        lineas = [f"Colisiones detectadas: {llaves} de llave, {cifrados} de cifrado "
+                  f"({len(pendientes)} sin resolver)."]
+        for c in pendientes:
+            lineas.append(f"  ⚠️ Alumno {c['id']:03d}: {c['tipo']} repetido con el alumno {c['con']:03d}")
+        return "\n".join(lineas)
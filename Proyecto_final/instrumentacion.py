@@ -0,0 +1,115 @@
+# ======================================================
+# Archivo: instrumentacion.py
+# Medición ligera de las rutas calientes: tiempo de pared y de CPU por etapa,
+# contadores (intentos de muestreo por rechazo, bytes escritos) y duraciones
+# por documento (compilación de cada PDF).
+#
+# Se activa con la variable de entorno HILL_PERFIL=1 (o con activar()). Al
+# salir del programa imprime una tabla en stderr y guarda una traza para
+# chrome://tracing / Perfetto en HILL_PERFIL_TRAZA (por defecto perfil_traza.json).
+# Apagada, etapa() devuelve un contexto vacío compartido y contar()/registrar()
+# regresan de inmediato. Solo se mide el proceso principal: los procesos de
+# un pool no reportan (las compilaciones se registran con su duración al volver).
+# ======================================================
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+
+ACTIVO = os.environ.get("HILL_PERFIL", "") not in ("", "0")
+RUTA_TRAZA = os.environ.get("HILL_PERFIL_TRAZA", "perfil_traza.json")
+
+_NULO = nullcontext()
+_etapas = defaultdict(lambda: [0, 0.0, 0.0])   # nombre -> [llamadas, pared, cpu]
+_contadores = defaultdict(int)
+_duraciones = defaultdict(list)                # nombre -> [segundos, ...]
+_eventos = []                                  # eventos "X" de la traza Chrome
+_T0 = time.perf_counter()
+
+class _Etapa:
+    __slots__ = ("nombre", "pared", "cpu")
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.pared = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        pared = time.perf_counter() - self.pared
+        cpu = time.process_time() - self.cpu
+        e = _etapas[self.nombre]
+        e[0] += 1
+        e[1] += pared
+        e[2] += cpu
+        _eventos.append({
+            "name": self.nombre, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+            "ts": round((self.pared - _T0) * 1e6, 1), "dur": round(pared * 1e6, 1),
+            "args": {"cpu_us": round(cpu * 1e6, 1)},
+        })
+        return False
+
+def etapa(nombre):
+    """with etapa("genera_paquetes.generar"): ...  (no hace nada si está apagada)."""
+    return _Etapa(nombre) if ACTIVO else _NULO
+
+def contar(nombre, n=1):
+    if ACTIVO:
+        _contadores[nombre] += n
+
+def registrar(nombre, segundos, etiqueta=None):
+    """Duración de un elemento (p. ej. la compilación de un PDF); va a la tabla y a la traza."""
+    if not ACTIVO:
+        return
+    _duraciones[nombre].append(segundos)
+    _eventos.append({
+        "name": etiqueta or nombre, "cat": nombre, "ph": "X", "pid": os.getpid(), "tid": 0,
+        "ts": round((time.perf_counter() - _T0 - segundos) * 1e6, 1), "dur": round(segundos * 1e6, 1),
+    })
+
+# ----------------------------------------
+# REPORTES
+# ----------------------------------------
+def resumen():
+    lineas = [f"{'etapa':44s} {'llamadas':>8s} {'pared (s)':>10s} {'cpu (s)':>10s}"]
+    for nombre, (n, pared, cpu) in sorted(_etapas.items(), key=lambda kv: -kv[1][1]):
+        lineas.append(f"{nombre:44s} {n:8d} {pared:10.4f} {cpu:10.4f}")
+    if _duraciones:
+        lineas.append("")
+        lineas.append(f"{'duraciones':44s} {'n':>8s} {'media':>10s} {'mediana':>10s} {'máx':>10s}")
+        for nombre, valores in sorted(_duraciones.items()):
+            orden = sorted(valores)
+            lineas.append(f"{nombre:44s} {len(orden):8d} {sum(orden)/len(orden):10.4f} "
+                          f"{orden[len(orden)//2]:10.4f} {orden[-1]:10.4f}")
+    if _contadores:
+        lineas.append("")
+        for nombre, n in sorted(_contadores.items()):
+            lineas.append(f"{nombre:44s} {n:>12,d}")
+    return "\n".join(lineas)
+
+def volcar_traza(ruta=None):
+    ruta = ruta or RUTA_TRAZA
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": _eventos, "displayTimeUnit": "ms",
+                   "otherData": {"contadores": dict(_contadores)}}, f)
+    return ruta
+
+def _al_salir():
+    if ACTIVO and (_etapas or _contadores or _duraciones):
+        print("\n" + resumen(), file=sys.stderr)
+        print(f"Traza Chrome: {volcar_traza()}", file=sys.stderr)
+
+def activar(ruta_traza=None):
+    """Enciende la medición desde código (equivale a HILL_PERFIL=1)."""
+    global ACTIVO, RUTA_TRAZA
+    ACTIVO = True
+    RUTA_TRAZA = ruta_traza or RUTA_TRAZA
+
+atexit.register(_al_salir)
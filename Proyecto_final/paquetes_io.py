@@ -0,0 +1,227 @@
+# ======================================================
+# Archivo: paquetes_io.py
+# Lectura y escritura de paquetes en JSON Lines (un alumno por línea) con un
+# índice de offsets por id, para recorrerlos en streaming o saltar a uno solo,
+# y en un almacén columnar (.npy por columna) legible con memoria mapeada.
+# ======================================================
+
+import json
+import os
+
+import numpy as np
+
+import instrumentacion as perfil
+
+EXT_INDICE = ".idx"
+
+# ----------------------------------------
+# ESCRITURA
+# ----------------------------------------
+class EscritorJsonl:
+    """Escribe paquetes uno por línea (JSON compacto) y, al cerrar, su índice id -> offset."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.indice = {}
+        self._f = open(ruta, "wb")
+
+    def escribir(self, paquete):
+        linea = json.dumps(paquete, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self.indice[paquete["id"]] = self._f.tell()
+        self._f.write(linea.encode("utf-8"))
+
+    def cerrar(self):
+        perfil.contar("bytes.jsonl", self._f.tell())
+        self._f.close()
+        with open(self.ruta + EXT_INDICE, "w", encoding="utf-8") as f:
+            json.dump(self.indice, f, separators=(",", ":"))
+
+    def descartar(self):
+        """Cierra y borra el .jsonl a medias (y un .idx anterior) para no dejar un par inconsistente."""
+        self._f.close()
+        for ruta in (self.ruta, self.ruta + EXT_INDICE):
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is not None:
+            self.descartar()
+        else:
+            self.cerrar()
+
+def escribir_jsonl(ruta, paquetes):
+    """Escribe un iterable de paquetes en `ruta` (.jsonl + .idx). Devuelve cuántos escribió."""
+    n = 0
+    with EscritorJsonl(ruta) as escritor:
+        for p in paquetes:
+            escritor.escribir(p)
+            n += 1
+    return n
+
+# ----------------------------------------
+# LECTURA
+# ----------------------------------------
+def iterar_paquetes(ruta):
+    """Recorre los paquetes de `ruta` sin cargar el archivo completo.
+
+    Acepta .jsonl (streaming), carpetas del almacén columnar y, por
+    compatibilidad, los .json con arreglo completo de versiones anteriores.
+    """
+    if os.path.isdir(ruta):
+        yield from AlmacenPaquetes(ruta)
+        return
+    if ruta.endswith(".json"):
+        with open(ruta, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+        return
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            if linea.strip():
+                yield json.loads(linea)
+
+def leer_indice(ruta):
+    """Índice {id: offset} del .jsonl; si no existe el .idx se reconstruye recorriendo el archivo."""
+    ruta_idx = ruta + EXT_INDICE
+    if os.path.exists(ruta_idx) and os.path.getmtime(ruta_idx) >= os.path.getmtime(ruta):
+        with open(ruta_idx, "r", encoding="utf-8") as f:
+            return {int(k): v for k, v in json.load(f).items()}
+    indice, offset = {}, 0
+    with open(ruta, "rb") as f:
+        for linea in f:
+            if linea.strip():
+                indice[json.loads(linea)["id"]] = offset
+            offset += len(linea)
+    return indice
+
+def leer_paquete(ruta, id_alumno, indice=None):
+    """Lee solo el paquete `id_alumno` saltando a su offset."""
+    indice = leer_indice(ruta) if indice is None else indice
+    with open(ruta, "rb") as f:
+        f.seek(indice[id_alumno])
+        return json.loads(f.readline())
+
+def _entero(x):
+    return int(x) if isinstance(x, float) and x.is_integer() else x
+
+def paquete_con_enteros(p):
+    """K y cadena cifrada del formato flotante anterior (8.0 -> 8) cuando son enteros exactos."""
+    p = dict(p)
+    p["K"] = [[_entero(x) for x in fila] for fila in p["K"]]
+    p["cadena_cifrada"] = [_entero(x) for x in p["cadena_cifrada"]]
+    return p
+
+def convertir_json_a_jsonl(ruta_json, ruta_jsonl):
+    """Convierte un archivo de paquetes con el formato anterior (arreglo indent=2)."""
+    return escribir_jsonl(ruta_jsonl, map(paquete_con_enteros, iterar_paquetes(ruta_json)))
+
+# ----------------------------------------
+# ALMACÉN COLUMNAR (un .npy por columna)
+# ----------------------------------------
+# carpeta/ids.npy         (N,)      int64
+# carpeta/K.npy           (N,3,3)   int64 (float64 si alguna llave no es entera)
+# carpeta/cifrado.npy     (N,L)     rellenado con 0 hasta la cadena más larga
+# carpeta/longitudes.npy  (N,)      largo real de cada cadena cifrada
+# carpeta/tipos.npy, carpeta/frases.npy  (N,) texto de ancho fijo (solo docente)
+COLUMNAS_TEXTO = {"tipos": "tipo", "frases": "frase_original"}
+
+def _entero_si_exacto(arr):
+    arr = np.asarray(arr)
+    if arr.dtype.kind == "f" and np.array_equal(arr, np.round(arr)):
+        return arr.astype(np.int64)
+    return arr
+
+def escribir_columnar(carpeta, paquetes):
+    """Guarda los paquetes como arreglos NumPy por columna. Devuelve cuántos guardó."""
+    ids, Ks, cifrados, textos = [], [], [], {c: [] for c in COLUMNAS_TEXTO}
+    for p in paquetes:
+        ids.append(p["id"])
+        Ks.append(p["K"])
+        cifrados.append(p["cadena_cifrada"])
+        for col, campo in COLUMNAS_TEXTO.items():
+            textos[col].append(p.get(campo))
+
+    longitudes = np.array([len(c) for c in cifrados], dtype=np.int64)
+    L = int(longitudes.max(initial=0))
+    valores = _entero_si_exacto([x for c in cifrados for x in c])
+    cifrado = np.zeros((len(cifrados), L), dtype=valores.dtype)
+    cifrado[np.arange(L) < longitudes[:, None]] = valores
+
+    os.makedirs(carpeta, exist_ok=True)
+    np.save(os.path.join(carpeta, "ids.npy"), np.array(ids, dtype=np.int64))
+    np.save(os.path.join(carpeta, "K.npy"), _entero_si_exacto(np.array(Ks).reshape(-1, 3, 3)))
+    np.save(os.path.join(carpeta, "cifrado.npy"), cifrado)
+    np.save(os.path.join(carpeta, "longitudes.npy"), longitudes)
+    for col, valores_col in textos.items():
+        if all(v is not None for v in valores_col) and valores_col:
+            np.save(os.path.join(carpeta, f"{col}.npy"), np.array(valores_col, dtype=str))
+    return len(ids)
+
+class AlmacenPaquetes:
+    """Vista de un almacén columnar; con mmap_mode='r' abrirlo no lee los datos.
+
+    `K[i]` y `cifrado[i, :longitudes[i]]` son vistas sin copia del alumno en la fila i.
+    """
+
+    def __init__(self, carpeta, mmap_mode="r"):
+        def cargar(nombre):
+            ruta = os.path.join(carpeta, f"{nombre}.npy")
+            return np.load(ruta, mmap_mode=mmap_mode) if os.path.exists(ruta) else None
+        self.ids = cargar("ids")
+        self.K = cargar("K")
+        self.cifrado = cargar("cifrado")
+        self.longitudes = cargar("longitudes")
+        self.tipos = cargar("tipos")
+        self.frases = cargar("frases")
+        self._filas = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def fila_de(self, id_alumno):
+        """Fila del alumno: búsqueda binaria si los ids están ordenados, si no un dict."""
+        if self._filas is None:
+            ordenados = bool(np.all(self.ids[1:] > self.ids[:-1]))
+            self._filas = True if ordenados else {int(v): n for n, v in enumerate(self.ids)}
+        if self._filas is True:
+            n = int(np.searchsorted(self.ids, id_alumno))
+            if n < len(self.ids) and self.ids[n] == id_alumno:
+                return n
+            raise KeyError(id_alumno)
+        return self._filas[id_alumno]
+
+    def cadena(self, n):
+        return self.cifrado[n, :self.longitudes[n]]
+
+    def paquete(self, n):
+        """Registro de la fila n con el mismo formato que los .jsonl."""
+        p = {"id": int(self.ids[n])}
+        if self.tipos is not None:
+            p["tipo"] = str(self.tipos[n])
+        if self.frases is not None:
+            p["frase_original"] = str(self.frases[n])
+            p["longitud"] = len(p["frase_original"])
+        p["K"] = self.K[n].tolist()
+        p["cadena_cifrada"] = self.cadena(n).tolist()
+        return p
+
+    def por_id(self, id_alumno):
+        return self.paquete(self.fila_de(id_alumno))
+
+    def __iter__(self):
+        for n in range(len(self)):
+            yield self.paquete(n)
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) != 3:
+        sys.exit("Uso: python paquetes_io.py entrada.json(l) salida.jsonl|carpeta_columnar")
+    entrada, salida = sys.argv[1], sys.argv[2]
+    if salida.endswith(".jsonl"):
+        n = escribir_jsonl(salida, iterar_paquetes(entrada))
+    else:
+        n = escribir_columnar(salida, iterar_paquetes(entrada))
+    print(f"✅ {n} paquetes convertidos a {salida}")
@@ -0,0 +1,135 @@
+# ======================================================
+# Archivo: pipeline_async.py
+# Modo en streaming: cada paquete generado se escribe en los .jsonl, se
+# convierte en su .tex y entra a una cola acotada de compilación, mientras
+# varios latexmk (subprocesos asyncio) van sacando PDFs de la cola. Así la
+# generación ocurre durante las esperas de LaTeX y el primer PDF sale en
+# segundos; el tiempo total se acerca al de la compilación sola.
+#
+# Uso: python pipeline_async.py [--trabajos 4] [--variante enteros] [--formato]
+# ======================================================
+
+import argparse
+import asyncio
+import hashlib
+import os
+import time
+
+import genera_paquetes
+from compilar_pdfs import (LATEXMK, _guardar_manifiesto, _leer_manifiesto, comando_con_formato,
+                           generar_formato, guardar_reporte, registro_compilacion, resumen_reporte)
+from corpus import cargar_corpus
+from generar_pdf_individuales import (CARPETA_SALIDA, NOMBRE_FORMATO, RUTA_INSTRUCCIONES,
+                                      documento_alumno, escribir_si_cambio, fuente_formato)
+from indice_unicidad import IndiceUnicidad
+from paquetes_io import EscritorJsonl
+import instrumentacion as perfil
+
+FIN = None  # marca de fin de la cola
+
+# ----------------------------------------
+# ETAPAS
+# ----------------------------------------
+async def producir(cola, paquetes, carpeta, instrucciones, usar_formato, manifiesto, reporte,
+                   salida_docente, salida_alumnos, trabajos):
+    """Paquete -> .jsonl -> .tex -> cola. La cola acotada frena la generación si LaTeX va atrás."""
+    with EscritorJsonl(salida_docente) as docente, EscritorJsonl(salida_alumnos) as alumnos:
+        for p in paquetes:
+            docente.escribir(p)
+            alumnos.escribir(genera_paquetes.version_alumno(p))
+            ruta_tex = os.path.join(carpeta, f"Proyecto_{p['id']:03d}.tex")
+            tex = documento_alumno(p, instrucciones, usar_formato)
+            escribir_si_cambio(ruta_tex, tex)
+            h = hashlib.sha256(tex.encode("utf-8")).hexdigest()
+            if manifiesto.get(os.path.basename(ruta_tex)) == h and os.path.exists(ruta_tex[:-4] + ".pdf"):
+                reporte["omitidos"].append(ruta_tex)
+                await asyncio.sleep(0)  # deja avanzar a los compiladores
+                continue
+            await cola.put((ruta_tex, h))
+    for _ in range(trabajos):
+        await cola.put(FIN)
+
+async def compilar_async(ruta_tex, comando):
+    carpeta = os.path.dirname(ruta_tex) or "."
+    inicio = time.perf_counter()
+    try:
+        proceso = await asyncio.create_subprocess_exec(
+            *comando, f"-outdir={carpeta}", ruta_tex,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+        codigo = await proceso.wait()
+    except FileNotFoundError:
+        codigo = 127  # compilador no instalado
+    return registro_compilacion(ruta_tex, codigo, time.perf_counter() - inicio)
+
+async def compilar(cola, comando, manifiesto, reporte, inicio):
+    while (tarea := await cola.get()) is not FIN:
+        ruta_tex, h = tarea
+        res = await compilar_async(ruta_tex, comando)
+        perfil.registrar("latex.compilacion", res["segundos"], os.path.basename(ruta_tex))
+        if res["ok"]:
+            manifiesto[os.path.basename(ruta_tex)] = h
+            reporte["compilados"].append(res)
+            reporte.setdefault("primer_pdf_segundos", round(time.perf_counter() - inicio, 3))
+        else:
+            manifiesto.pop(os.path.basename(ruta_tex), None)
+            reporte["fallidos"].append(res)
+
+# ----------------------------------------
+# PIPELINE
+# ----------------------------------------
+async def pipeline(ruta_frases=genera_paquetes.RUTA_FRASES, semilla=genera_paquetes.SEMILLA,
+                   variante=genera_paquetes.VARIANTE, carpeta=CARPETA_SALIDA,
+                   ruta_instrucciones=RUTA_INSTRUCCIONES, trabajos=None, usar_formato=False,
+                   salida_docente=genera_paquetes.SALIDA_DOCENTE, salida_alumnos=genera_paquetes.SALIDA_ALUMNOS):
+    inicio = time.perf_counter()
+    trabajos = trabajos or os.cpu_count() or 1
+    os.makedirs(carpeta, exist_ok=True)
+    with open(ruta_instrucciones, "r", encoding="utf-8") as f:
+        instrucciones = f.read()
+
+    comando = LATEXMK
+    if usar_formato:
+        ruta_fuente = os.path.join(carpeta, NOMBRE_FORMATO + ".tex")
+        escribir_si_cambio(ruta_fuente, fuente_formato(instrucciones))
+        formato = await asyncio.get_running_loop().run_in_executor(None, generar_formato, ruta_fuente)
+        comando = comando_con_formato(formato)
+
+    corpus = cargar_corpus(ruta_frases)
+    genera_paquetes.revisar_corpus(corpus, variante)
+    indice = IndiceUnicidad()
+    paquetes = genera_paquetes.generar_paquetes(corpus.textos, corpus.tipos, indice, semilla, 1, variante)
+
+    manifiesto = _leer_manifiesto(carpeta)
+    reporte = {"compilados": [], "omitidos": [], "fallidos": []}
+    cola = asyncio.Queue(maxsize=2 * trabajos)
+    await asyncio.gather(
+        producir(cola, paquetes, carpeta, instrucciones, usar_formato, manifiesto, reporte,
+                 salida_docente, salida_alumnos, trabajos),
+        *(compilar(cola, comando, manifiesto, reporte, inicio) for _ in range(trabajos)),
+    )
+    _guardar_manifiesto(carpeta, manifiesto)
+    reporte["total_segundos"] = round(time.perf_counter() - inicio, 3)
+    guardar_reporte(carpeta, reporte)
+    print(indice.reporte())
+    return reporte
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera, escribe y compila los proyectos en streaming.")
+    parser.add_argument("--frases", default=genera_paquetes.RUTA_FRASES)
+    parser.add_argument("--semilla", type=int, default=genera_paquetes.SEMILLA)
+    parser.add_argument("--variante", choices=sorted(genera_paquetes.VARIANTES), default=genera_paquetes.VARIANTE)
+    parser.add_argument("--carpeta", default=CARPETA_SALIDA)
+    parser.add_argument("--trabajos", type=int, default=None, help="latexmk simultáneos (por defecto, núcleos)")
+    parser.add_argument("--formato", action="store_true", help="precompilar el preámbulo común (mylatexformat)")
+    args = parser.parse_args(argv)
+
+    reporte = asyncio.run(pipeline(args.frases, args.semilla, args.variante, args.carpeta,
+                                   trabajos=args.trabajos, usar_formato=args.formato))
+    print(resumen_reporte(reporte))
+    if "primer_pdf_segundos" in reporte:
+        print(f"Primer PDF a los {reporte['primer_pdf_segundos']} s; total {reporte['total_segundos']} s")
+    return reporte
+
+
+if __name__ == "__main__":
+    main()
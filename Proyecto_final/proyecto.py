@@ -0,0 +1,236 @@
+# ======================================================
+# Archivo: proyecto.py
+# Punto de entrada único del proyecto Hill. Cada subcomando es una etapa:
+#
+#   python proyecto.py generate --variante enteros --frases frases/frases_120_cortas.txt
+#   python proyecto.py render-master [--compilar]
+#   python proyecto.py render-individual [--formato]
+#   python proyecto.py grade entregas.jsonl [--variante gauss]
+#   python proyecto.py bench --tamanos 300 10000
+#
+# La salida de cada etapa se guarda en CACHE/<etapa>/<huella>/, donde la huella
+# es el sha256 de sus entradas (archivos, semilla, variante, plantillas y el
+# código de los módulos que la producen). Si la huella ya existe, la etapa no
+# se vuelve a ejecutar y solo se copian sus archivos a la ruta pedida.
+# ======================================================
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import genera_paquetes
+import instrumentacion
+
+CACHE = ".cache_proyecto"
+AQUI = os.path.dirname(os.path.abspath(__file__))
+
+# Código del que depende cada etapa (si cambia, la huella cambia)
+FUENTES = {
+    "generate": ["genera_paquetes.py", "corpus.py", "semillas.py", "indice_unicidad.py", "codec.py", "paquetes_io.py",
+                 "hill_3x3_gauss.py", "hill_3x3_gauss_enteros.py", "hill_3x3_mod29.py", "catalogo_unimodular.py"],
+    "render-master": ["generar_proyecto_final_latex.py", "paquetes_io.py"],
+    "render-individual": ["generar_pdf_individuales.py", "compilar_pdfs.py", "paquetes_io.py"],
+    "grade": ["calificador.py", "hill_3x3_gauss.py", "hill_3x3_gauss_enteros.py",
+              "hill_3x3_mod29.py", "codec.py", "paquetes_io.py"],
+}
+
+# ----------------------------------------
+# HUELLAS Y CACHÉ
+# ----------------------------------------
+def _actualizar_con_archivo(h, ruta):
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+
+def huella(etapa, archivos=(), fuentes=(), **parametros):
+    """sha256 de la etapa: código fuente, archivos de entrada y parámetros."""
+    h = hashlib.sha256(etapa.encode())
+    for nombre in list(FUENTES.get(etapa, [])) + list(fuentes):
+        h.update(nombre.encode())
+        _actualizar_con_archivo(h, os.path.join(AQUI, nombre))
+    for ruta in archivos:
+        h.update(b"\0archivo\0")
+        _actualizar_con_archivo(h, ruta)
+    h.update(json.dumps(parametros, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+def etapa_en_cache(cache, etapa, clave, producir):
+    """Carpeta con la salida de la etapa; `producir(carpeta)` solo corre si no estaba.
+
+    Se produce en una carpeta temporal y se renombra al final, así una corrida
+    interrumpida nunca deja una entrada a medias en la caché.
+    """
+    destino = os.path.join(cache, etapa, clave[:16])
+    if os.path.isdir(destino):
+        print(f"♻️  {etapa}: sin cambios (caché {clave[:16]})")
+        return destino
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporal = tempfile.mkdtemp(prefix=".tmp_", dir=os.path.dirname(destino))
+    try:
+        producir(temporal)
+        os.replace(temporal, destino)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    return destino
+
+def copiar(carpeta, nombre, ruta_destino):
+    """Copia un archivo de la caché (y su índice .idx si existe) a su ruta final."""
+    if os.path.dirname(ruta_destino):
+        os.makedirs(os.path.dirname(ruta_destino), exist_ok=True)
+    origen = os.path.join(carpeta, nombre)
+    shutil.copyfile(origen, ruta_destino)
+    if os.path.exists(origen + ".idx"):
+        shutil.copyfile(origen + ".idx", ruta_destino + ".idx")
+
+# ----------------------------------------
+# SUBCOMANDOS
+# ----------------------------------------
+def cmd_generate(args):
+    modulo = genera_paquetes.VARIANTES[args.variante]
+    archivos = [args.frases]
+    if args.catalogo:
+        if args.variante != "enteros":
+            raise SystemExit("--catalogo solo aplica a la variante enteros")
+        modulo.usar_catalogo(args.catalogo, args.dificultad)
+        # Todo el catálogo (indice.json y las columnas .npy), en orden fijo
+        archivos += [os.path.join(args.catalogo, n) for n in sorted(os.listdir(args.catalogo))
+                     if os.path.isfile(os.path.join(args.catalogo, n))]
+    clave = huella("generate", archivos,
+                   semilla=args.semilla, variante=args.variante, dificultad=args.dificultad)
+
+    def producir(carpeta):
+        genera_paquetes.main(args.semilla, args.trabajos, args.variante, args.frases,
+                             os.path.join(carpeta, "docente.jsonl"), os.path.join(carpeta, "alumnos.jsonl"))
+
+    carpeta = etapa_en_cache(args.cache, "generate", clave, producir)
+    copiar(carpeta, "docente.jsonl", args.docente)
+    copiar(carpeta, "alumnos.jsonl", args.alumnos)
+    print(f"✅ Paquetes en {args.docente} y {args.alumnos}")
+
+def cmd_render_master(args):
+    from generar_proyecto_final_latex import generar_documento
+    clave = huella("render-master", [args.alumnos])
+
+    carpeta = etapa_en_cache(args.cache, "render-master", clave,
+                             lambda c: generar_documento(args.alumnos, os.path.join(c, "maestro.tex")))
+    copiar(carpeta, "maestro.tex", args.salida)
+    print(f"✅ Documento maestro: {args.salida}")
+    if args.compilar:
+        import dividir_pdf
+        dividir_pdf.main(args.salida, args.carpeta)
+
+def _marca_vigente(marca, clave):
+    """La marca coincide y siguen en disco todos los PDFs que registró compilar_lote."""
+    if not os.path.exists(marca):
+        return False
+    with open(marca, "r", encoding="utf-8") as f:
+        if f.read() != clave:
+            return False
+    from compilar_pdfs import _leer_manifiesto
+    carpeta = os.path.dirname(marca)
+    compilados = _leer_manifiesto(carpeta)
+    return bool(compilados) and all(
+        os.path.exists(os.path.join(carpeta, os.path.splitext(nombre)[0] + ".pdf")) for nombre in compilados)
+
+def cmd_render_individual(args):
+    import generar_pdf_individuales as individuales
+    # La caché de esta etapa es la propia carpeta de salida: cada .tex se reescribe
+    # solo si cambió y compilar_lote solo recompila los .tex con hash distinto.
+    # La marca solo evita ese recorrido si además no falta ningún PDF.
+    clave = huella("render-individual", [args.docente, args.instrucciones], formato=args.formato)
+    marca = os.path.join(args.carpeta, ".huella_etapa")
+    if _marca_vigente(marca, clave):
+        print(f"♻️  render-individual: sin cambios (caché {clave[:16]})")
+        return
+    reporte = individuales.main(args.formato, args.docente, args.carpeta, args.instrucciones, args.trabajos)
+    if not reporte["fallidos"]:
+        with open(marca, "w", encoding="utf-8") as f:
+            f.write(clave)
+
+def cmd_grade(args):
+    import calificador
+    clave = huella("grade", [args.docente, args.entregas], variante=args.variante)
+
+    def producir(carpeta):
+        reporte = calificador.calificar(args.docente, args.entregas, args.variante)
+        with open(os.path.join(carpeta, "reporte.json"), "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+
+    carpeta = etapa_en_cache(args.cache, "grade", clave, producir)
+    with open(os.path.join(carpeta, "reporte.json"), "r", encoding="utf-8") as f:
+        reporte = json.load(f)
+    if args.salida:
+        copiar(carpeta, "reporte.json", args.salida)
+    print(json.dumps(reporte["resumen"], ensure_ascii=False, indent=2))
+
+def cmd_bench(args):
+    # Una medición no se guarda en caché: siempre se vuelve a correr
+    import benchmark
+    benchmark.main(args.resto)
+
+# ----------------------------------------
+# ARGUMENTOS
+# ----------------------------------------
+def construir_parser():
+    parser = argparse.ArgumentParser(description="Proyecto final Hill: generación, LaTeX, calificación y benchmark.")
+    parser.add_argument("--cache", default=CACHE, help=f"carpeta de caché por etapa (por defecto {CACHE})")
+    parser.add_argument("--perfil", action="store_true", help="medir etapas y contadores (igual que HILL_PERFIL=1)")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("generate", help="genera los paquetes docente y alumnos")
+    p.add_argument("--frases", default=genera_paquetes.RUTA_FRASES)
+    p.add_argument("--semilla", type=int, default=genera_paquetes.SEMILLA)
+    p.add_argument("--variante", choices=sorted(genera_paquetes.VARIANTES), default=genera_paquetes.VARIANTE)
+    p.add_argument("--trabajos", type=int, default=genera_paquetes.TRABAJOS)
+    p.add_argument("--catalogo", default=None, help="carpeta de catalogo_unimodular.py (variante enteros)")
+    p.add_argument("--dificultad", choices=["facil", "media", "dificil"], default=None)
+    p.add_argument("--docente", default=genera_paquetes.SALIDA_DOCENTE)
+    p.add_argument("--alumnos", default=genera_paquetes.SALIDA_ALUMNOS)
+    p.set_defaults(funcion=cmd_generate)
+
+    p = sub.add_parser("render-master", help="documento maestro con todos los alumnos")
+    p.add_argument("--alumnos", default=genera_paquetes.SALIDA_ALUMNOS)
+    p.add_argument("--salida", default="frases/Proyecto_Final_Algebra_Lineal_v2.tex")
+    p.add_argument("--compilar", action="store_true", help="compilar el maestro y separarlo por alumno")
+    p.add_argument("--carpeta", default="Proyecto_final_individual/pdfs_alumnos")
+    p.set_defaults(funcion=cmd_render_master)
+
+    p = sub.add_parser("render-individual", help="un .tex/.pdf por alumno (compilación incremental)")
+    p.add_argument("--docente", default=genera_paquetes.SALIDA_DOCENTE)
+    p.add_argument("--instrucciones", default="instrucciones_y_ejemplo.tex")
+    p.add_argument("--carpeta", default="Proyecto_final_individual/pdfs_alumnos")
+    p.add_argument("--formato", action="store_true", help="precompilar el preámbulo común (mylatexformat)")
+    p.add_argument("--trabajos", type=int, default=None)
+    p.set_defaults(funcion=cmd_render_individual)
+
+    p = sub.add_parser("grade", help="califica las entregas contra la clave del docente")
+    p.add_argument("entregas")
+    p.add_argument("--docente", default=genera_paquetes.SALIDA_DOCENTE)
+    p.add_argument("--variante", choices=sorted(genera_paquetes.VARIANTES), default=genera_paquetes.VARIANTE)
+    p.add_argument("--salida", default=None)
+    p.set_defaults(funcion=cmd_grade)
+
+    # Las opciones de benchmark.py (--tamanos, --etapas, ...) no se declaran aquí:
+    # main las pasa tal cual a cmd_bench
+    p = sub.add_parser("bench", help="benchmark de todas las etapas (argumentos de benchmark.py)")
+    p.set_defaults(funcion=cmd_bench)
+    return parser
+
+def main(argv=None):
+    parser = construir_parser()
+    args, resto = parser.parse_known_args(argv)
+    if resto and args.comando != "bench":
+        parser.error(f"argumentos no reconocidos: {' '.join(resto)}")
+    args.resto = resto
+    if args.perfil:
+        instrumentacion.activar()
+    return args.funcion(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
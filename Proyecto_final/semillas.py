@@ -0,0 +1,26 @@
+# ======================================================
+# Archivo: semillas.py
+# Flujos aleatorios independientes por alumno derivados de una semilla maestra
+# (estilo numpy.random.SeedSequence.spawn): el paquete k no depende de los
+# anteriores, así que la cohorte se puede repartir entre procesos o regenerar
+# un solo alumno y el resultado es idéntico.
+# ======================================================
+
+import random
+
+import numpy as np
+
+SEMILLA_MAESTRA = 2025
+
+def secuencia_alumno(semilla, id_alumno, intento=0):
+    """SeedSequence del alumno: hija (id_alumno, intento) de la semilla maestra."""
+    return np.random.SeedSequence(semilla, spawn_key=(id_alumno, intento))
+
+def flujo_alumno(semilla, id_alumno, intento=0):
+    """random.Random propio del alumno (para los módulos que usan la API de `random`)."""
+    estado = secuencia_alumno(semilla, id_alumno, intento).generate_state(4, np.uint64)
+    return random.Random(int.from_bytes(estado.tobytes(), "little"))
+
+def generador_alumno(semilla, id_alumno, intento=0):
+    """numpy.random.Generator propio del alumno."""
+    return np.random.default_rng(secuencia_alumno(semilla, id_alumno, intento))
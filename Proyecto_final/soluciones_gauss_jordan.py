@@ -0,0 +1,233 @@
+# ======================================================
+# Archivo: soluciones_gauss_jordan.py
+# Cuadernillo de soluciones para el docente: para cada llave registra la
+# reducción completa de [K | I] por Gauss–Jordan (fracciones exactas, o mod 29
+# para la variante mod29), descifra bloque por bloque y escribe una página
+# LaTeX por alumno.
+#
+# Las trazas se guardan en disco por el sha256 de la llave (y el módulo), así
+# que las llaves repetidas o ya vistas no se recalculan; las nuevas se calculan
+# en un pool de procesos.
+#
+# Uso: python soluciones_gauss_jordan.py [--docente frases/paquetes_300_docente.jsonl]
+#                                        [--variante gauss] [--salida frases/Soluciones.tex]
+# ======================================================
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+
+from calificador import VARIANTES
+from paquetes_io import iterar_paquetes
+import instrumentacion as perfil
+
+RUTA_DOCENTE = "frases/paquetes_300_docente.jsonl"
+RUTA_SALIDA = "frases/Soluciones_Gauss_Jordan.tex"
+CACHE_TRAZAS = ".cache_trazas"
+BLOQUES_POR_FILA = 3
+
+# ----------------------------------------
+# NÚMEROS EXACTOS
+# ----------------------------------------
+def _exacto(x):
+    """Entrada de K (int, float entero o texto) -> Fraction."""
+    return Fraction(str(x)) if isinstance(x, float) else Fraction(x)
+
+def _texto(x):
+    """Fraction o int -> "a" o "a/b" (formato de la caché)."""
+    return str(x)
+
+def _leer(s):
+    return Fraction(s)
+
+# ----------------------------------------
+# TRAZA DE GAUSS–JORDAN
+# ----------------------------------------
+def traza_gauss_jordan(K, modulo=None):
+    """Reduce [K | I] paso a paso; devuelve {"pasos": [...], "inversa": [[...]]}.
+
+    Cada paso es {"op": (tipo, fila, otra, factor), "matriz": [[...]]} con el
+    estado completo después de la operación. tipo: "intercambio" (R_i <-> R_j),
+    "escala" (R_i <- f·R_i) o "elimina" (R_i <- R_i - f·R_j). Con módulo todo
+    se reduce mod m y "escala" multiplica por el inverso modular del pivote.
+    """
+    n = len(K)
+    if modulo is None:
+        A = [[_exacto(x) for x in fila] + [Fraction(int(r == c)) for c in range(n)] for r, fila in enumerate(K)]
+    else:
+        A = [[int(x) % modulo for x in fila] + [int(r == c) for c in range(n)] for r, fila in enumerate(K)]
+
+    def reducir(x):
+        return x % modulo if modulo is not None else x
+
+    pasos = []
+    def anotar(*op):
+        pasos.append({"op": [op[0], op[1], op[2], _texto(op[3])], "matriz": [[_texto(x) for x in fila] for fila in A]})
+
+    for k in range(n):
+        fila = next((r for r in range(k, n) if A[r][k] != 0), None)
+        if fila is None:
+            raise ValueError("La matriz no es invertible" + (f" mod {modulo}." if modulo else "."))
+        if fila != k:
+            A[k], A[fila] = A[fila], A[k]
+            anotar("intercambio", k, fila, 0)
+        if A[k][k] != 1:
+            f = pow(A[k][k], -1, modulo) if modulo is not None else 1 / A[k][k]
+            A[k] = [reducir(f * x) for x in A[k]]
+            anotar("escala", k, k, f)
+        for i in range(n):
+            f = A[i][k]
+            if i != k and f != 0:
+                A[i] = [reducir(x - f * y) for x, y in zip(A[i], A[k])]
+                anotar("elimina", i, k, f)
+    inversa = [[_texto(x) for x in fila[n:]] for fila in A]
+    return {"modulo": modulo, "K": [[_texto(_exacto(x)) for x in fila] for fila in K], "pasos": pasos, "inversa": inversa}
+
+def huella_llave(K, modulo=None):
+    canonica = json.dumps([[_texto(_exacto(x)) for x in fila] for fila in K] + [modulo], separators=(",", ":"))
+    return hashlib.sha256(canonica.encode()).hexdigest()
+
+def _calcular(args):
+    K, modulo = args
+    return traza_gauss_jordan(K, modulo)
+
+def trazas_cohorte(Ks, modulo=None, cache=CACHE_TRAZAS, trabajos=None):
+    """Trazas de todas las llaves: primero la caché en disco, el resto en un pool."""
+    os.makedirs(cache, exist_ok=True)
+    huellas = [huella_llave(K, modulo) for K in Ks]
+    trazas, faltantes = {}, {}
+    for h, K in zip(huellas, Ks):
+        if h in trazas or h in faltantes:
+            continue
+        ruta = os.path.join(cache, h + ".json")
+        if os.path.exists(ruta):
+            with open(ruta, "r", encoding="utf-8") as f:
+                trazas[h] = json.load(f)
+        else:
+            faltantes[h] = K
+    perfil.contar("soluciones.trazas_en_cache", len(trazas))
+    perfil.contar("soluciones.trazas_nuevas", len(faltantes))
+    if faltantes:
+        with perfil.etapa("soluciones.trazas"), ProcessPoolExecutor(max_workers=trabajos) as pool:
+            nuevas = pool.map(_calcular, [(K, modulo) for K in faltantes.values()], chunksize=16)
+            for h, traza in zip(faltantes, nuevas):
+                trazas[h] = traza
+                with open(os.path.join(cache, h + ".json"), "w", encoding="utf-8") as f:
+                    json.dump(traza, f, separators=(",", ":"))
+    return [trazas[h] for h in huellas]
+
+# ----------------------------------------
+# DESCIFRADO POR BLOQUES
+# ----------------------------------------
+def descifrar_bloques(traza, cifrado, codec):
+    """[(bloque cifrado, bloque plano, texto)] aplicando K⁻¹ de la traza a cada bloque."""
+    modulo = traza["modulo"]
+    inversa = [[_leer(x) for x in fila] for fila in traza["inversa"]]
+    n = len(inversa)
+    bloques = []
+    for j in range(0, len(cifrado), n):
+        c = [_exacto(x) for x in cifrado[j:j + n]]
+        p = [sum(a * b for a, b in zip(fila, c)) for fila in inversa]
+        p = [int(x) % modulo if modulo is not None else x for x in p]
+        if any(Fraction(x).denominator != 1 for x in p):
+            raise ValueError("El bloque descifrado no es entero: la llave no corresponde al cifrado.")
+        p = [int(x) for x in p]
+        bloques.append(([int(x) for x in c], p, codec.decodificar(p)))
+    return bloques
+
+# ----------------------------------------
+# LaTeX
+# ----------------------------------------
+def tex_numero(s):
+    x = _leer(s)
+    if x.denominator == 1:
+        return str(x.numerator)
+    signo = "-" if x < 0 else ""
+    return rf"{signo}\tfrac{{{abs(x.numerator)}}}{{{x.denominator}}}"
+
+def tex_aumentada(M, n):
+    filas = [" & ".join(tex_numero(x) for x in fila) for fila in M]
+    return (r"\left(\begin{array}{" + "r" * n + "|" + "r" * n + "}" + r" \\ ".join(filas) + r"\end{array}\right)")
+
+def tex_operacion(op):
+    tipo, i, j, f = op
+    if tipo == "intercambio":
+        return rf"R_{i+1} \leftrightarrow R_{j+1}"
+    if tipo == "escala":
+        return rf"R_{i+1} \leftarrow {tex_numero(f)}\,R_{i+1}"
+    x = _leer(f)
+    if x < 0:
+        return rf"R_{i+1} \leftarrow R_{i+1} + {tex_numero(str(-x))}\,R_{j+1}"
+    return rf"R_{i+1} \leftarrow R_{i+1} - {tex_numero(f)}\,R_{j+1}"
+
+def tex_matriz(M):
+    return r"\begin{pmatrix}" + r" \\ ".join(" & ".join(tex_numero(x) for x in fila) for fila in M) + r"\end{pmatrix}"
+
+def tex_texto(s):
+    return s.replace(" ", r"\textvisiblespace{}")
+
+def pagina_solucion(p, traza, bloques):
+    n = len(traza["K"])
+    mod = rf" \pmod{{{traza['modulo']}}}" if traza["modulo"] is not None else ""
+    inicial = [fila + [str(int(r == c)) for c in range(n)] for r, fila in enumerate(traza["K"])]
+    partes = [
+        rf"\section*{{Solución del proyecto {p['id']:03d}}}",
+        r"\textbf{Gauss--Jordan sobre $[K \mid I]$}" + (f" (aritmética mod {traza['modulo']})" if mod else ""),
+        r"{\small\begin{align*}",
+        "& " + tex_aumentada(inicial, n) + r" \\",
+    ]
+    for paso in traza["pasos"]:
+        partes.append(r"\xrightarrow{" + tex_operacion(paso["op"]) + "} & " + tex_aumentada(paso["matriz"], n) + r" \\")
+    partes.append(r"\end{align*}}")
+    partes.append(r"\[ K^{-1} = " + tex_matriz(traza["inversa"]) + mod + r" \]")
+    partes.append(r"\textbf{Descifrado por bloques} ($\mathbf{p} = K^{-1}\mathbf{c}$" + (mod and f" mod {traza['modulo']}") + "):")
+    partes.append(r"{\footnotesize\begin{center}\begin{tabular}{" + "c" * BLOQUES_POR_FILA + "}")
+    celdas = [rf"$({','.join(map(str, c))}) \mapsto ({','.join(map(str, q))})$ \texttt{{{tex_texto(t)}}}" for c, q, t in bloques]
+    for k in range(0, len(celdas), BLOQUES_POR_FILA):
+        partes.append(" & ".join(celdas[k:k + BLOQUES_POR_FILA]) + r" \\[2pt]")
+    partes.append(r"\end{tabular}\end{center}}")
+    frase = "".join(t for _, _, t in bloques)
+    partes.append(r"\textbf{Mensaje:} \texttt{" + tex_texto(frase) + "}")
+    partes.append(r"\newpage")
+    return "\n".join(partes) + "\n"
+
+ENCABEZADO = r"""\documentclass[11pt]{article}
+\usepackage[spanish]{babel}
+\usepackage[T1]{fontenc}
+\usepackage{amsmath, amssymb}
+\usepackage[a4paper,margin=2cm]{geometry}
+\allowdisplaybreaks
+\setlength{\parindent}{0pt}
+\begin{document}
+"""
+
+def generar_soluciones(ruta_docente=RUTA_DOCENTE, ruta_salida=RUTA_SALIDA, variante="gauss",
+                       cache=CACHE_TRAZAS, trabajos=None):
+    codec, modulo = VARIANTES[variante]
+    paquetes = list(iterar_paquetes(ruta_docente))
+    trazas = trazas_cohorte([p["K"] for p in paquetes], modulo, cache, trabajos)
+    with perfil.etapa("soluciones.latex"), open(ruta_salida, "w", encoding="utf-8", buffering=1 << 16) as out:
+        out.write(ENCABEZADO)
+        for p, traza in zip(paquetes, trazas):
+            out.write(pagina_solucion(p, traza, descifrar_bloques(traza, p["cadena_cifrada"], codec)))
+        out.write("\\end{document}\n")
+        perfil.contar("bytes.tex", out.tell())
+    return len(paquetes)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cuadernillo de soluciones Gauss–Jordan para el docente.")
+    parser.add_argument("--docente", default=RUTA_DOCENTE)
+    parser.add_argument("--salida", default=RUTA_SALIDA)
+    parser.add_argument("--variante", choices=sorted(VARIANTES), default="gauss")
+    parser.add_argument("--cache", default=CACHE_TRAZAS)
+    parser.add_argument("--trabajos", type=int, default=None)
+    args = parser.parse_args(argv)
+    n = generar_soluciones(args.docente, args.salida, args.variante, args.cache, args.trabajos)
+    print(f"✅ {n} páginas de solución en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
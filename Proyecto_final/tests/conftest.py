@@ -0,0 +1,5 @@
+# Los módulos del proyecto se importan planos (se corren desde Proyecto_final/)
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
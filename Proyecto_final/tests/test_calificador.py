@@ -0,0 +1,40 @@
+# El calificador usa la variante por defecto de genera_paquetes y una entrega
+# mal formada cuenta como error, sin detener la calificación del grupo.
+
+import os
+from fractions import Fraction
+
+import calificador
+import genera_paquetes
+import hill_3x3_gauss_enteros as enteros
+from paquetes_io import escribir_jsonl, iterar_paquetes
+
+FRASES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      "frases", "frases_120_cortas.txt")
+
+
+def _inversa(K):
+    det = enteros.det3(K)
+    return [[str(Fraction(a, det)) for a in fila] for fila in enteros.adjugate3(K)]
+
+
+def test_entregas_mal_formadas(tmp_path):
+    docente, alumnos = str(tmp_path / "docente.jsonl"), str(tmp_path / "alumnos.jsonl")
+    genera_paquetes.main(trabajos=1, ruta_frases=FRASES, salida_docente=docente, salida_alumnos=alumnos)
+    p1, p2, p3, p4 = list(iterar_paquetes(docente))[:4]
+    entregas = str(tmp_path / "entregas.jsonl")
+    escribir_jsonl(entregas, [
+        {"id": 1, "frase": p1["frase_original"], "K_inv": _inversa(p1["K"])},
+        {"id": 2, "K_inv": [["-29/-223"] * 3] * 3},
+        {"id": 3, "K_inv": [[1, 0], [0, 1]]},
+        {"id": 4, "K_inv": [["1/0"] * 3] * 3},
+        {"id": 5, "K_inv": None},
+    ])
+
+    reporte = calificador.calificar(docente, entregas)
+    assert reporte["resumen"]["variante"] == genera_paquetes.VARIANTE
+    assert reporte["resumen"]["frases_correctas"] == 1
+    assert reporte["resumen"]["inversas_correctas"] == 1
+    errores = {d["id"] for d in reporte["desajustes"] if d["campo"] == "K_inv"}
+    assert errores == {2, 3, 4, 5}
+    assert not [d for d in reporte["desajustes"] if d["campo"] == "clave"]
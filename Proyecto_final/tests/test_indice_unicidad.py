@@ -0,0 +1,41 @@
+# Llaves equivalentes por permutación y tramos cifrados compartidos se detectan.
+
+import random
+
+from indice_unicidad import IndiceUnicidad, PERMS_3, clave_canonica
+
+
+def _permutada(K, filas, columnas):
+    return [[K[f][c] for c in columnas] for f in filas]
+
+
+def test_clave_canonica_invariante_a_permutaciones():
+    K = [[8, 3, 1], [9, 3, 8], [9, 7, 9]]
+    claves = {clave_canonica(_permutada(K, f, c)) for f in PERMS_3 for c in PERMS_3}
+    assert claves == {clave_canonica(K)}
+    assert clave_canonica([[8.0, 3.0, 1.0], [9.0, 3.0, 8.0], [9.0, 7.0, 9.0]]) == clave_canonica(K)
+    assert clave_canonica([[8, 3, 1], [9, 3, 8], [9, 7, 10]]) != clave_canonica(K)
+
+
+def test_llave_permutada_es_conflicto():
+    K = [[2, 1, 0], [1, 1, 0], [0, 0, 1]]
+    indice = IndiceUnicidad()
+    indice.agregar(1, K, [])
+    conflictos = indice.revisar(2, _permutada(K, (2, 0, 1), (1, 2, 0)), [])
+    assert conflictos == [{"tipo": "llave", "id": 2, "con": 1}]
+
+
+def test_tramo_cifrado_compartido():
+    rng = random.Random(0)
+    tramo = [rng.randrange(1000) for _ in range(12)]           # 4 bloques de 3
+    base = [rng.randrange(1000) for _ in range(9)] + tramo + [rng.randrange(1000) for _ in range(6)]
+    indice = IndiceUnicidad(ventana=4)
+    indice.agregar(1, [[1, 0, 0], [0, 1, 0], [0, 0, 1]], base)
+
+    K = [[2, 1, 0], [1, 1, 0], [0, 0, 1]]
+    otro = [rng.randrange(1000, 2000) for _ in range(3)] + tramo + [rng.randrange(1000, 2000) for _ in range(3)]
+    assert indice.revisar(2, K, otro) == [{"tipo": "cifrado", "id": 2, "con": 1}]
+
+    # Tres bloques compartidos no alcanzan la ventana
+    corto = [rng.randrange(1000, 2000) for _ in range(3)] + tramo[:9] + [rng.randrange(1000, 2000) for _ in range(6)]
+    assert indice.revisar(2, K, corto) == []
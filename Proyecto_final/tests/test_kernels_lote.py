@@ -0,0 +1,95 @@
+# Los kernels por lotes deben coincidir con las funciones escalares de cada módulo.
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+import catalogo_unimodular as catalogo
+import hill_3x3_gauss_enteros as enteros
+import hill_3x3_mod29 as mod29
+import hill_nxn
+
+
+def _pila(n=200, lo=-9, hi=9, semilla=0):
+    return np.random.default_rng(semilla).integers(lo, hi + 1, size=(n, 3, 3))
+
+
+def test_adjunta_y_determinante_enteros():
+    Ms = _pila()
+    adj = enteros.adjugate3_batch(Ms)
+    det = enteros.det3_batch(Ms, adj)
+    for M, a, d in zip(Ms.tolist(), adj.tolist(), det.tolist()):
+        assert a == enteros.adjugate3(M)
+        assert d == enteros.det3(M)
+
+
+def test_kernels_mod29():
+    Ks = mod29.random_invertible_matrices_3x3(200, rng=np.random.default_rng(1))
+    adj = mod29.mat_adj_mod_batch(Ks)
+    det = mod29.mat_det_mod_batch(Ks)
+    inv = mod29.mat_inv_mod_batch(Ks)
+    for K, a, d, i in zip(Ks.tolist(), adj.tolist(), det.tolist(), inv.tolist()):
+        assert a == mod29.mat_adj_mod(K)
+        assert d == mod29.mat_det_mod(K)
+        assert i == mod29.mat_inv_mod(K)
+
+
+def test_cifrado_por_lotes_mod29():
+    rng = random.Random(2)
+    frases = ["".join(rng.choice(mod29.SYMS) for _ in range(rng.randrange(1, 40))) for _ in range(50)]
+    Ks = mod29.random_invertible_matrices_3x3(len(frases), rng=np.random.default_rng(3))
+    msgs, longitudes = mod29.texts_to_array(frases)
+    cifrados = mod29.encrypt_batch(Ks, msgs)
+    for K, frase, c, n in zip(Ks.tolist(), frases, cifrados.tolist(), longitudes.tolist()):
+        esperado = mod29.encrypt_with_key(K, frase)
+        assert c[:len(esperado)] == esperado
+        assert n == len(frase)
+    assert mod29.array_to_texts(mod29.decrypt_batch(Ks, cifrados), longitudes) == frases
+
+
+def test_bareiss_nxn():
+    rng = random.Random(4)
+    for n in range(hill_nxn.TAM_MIN, hill_nxn.TAM_MAX + 1):
+        A = [[rng.randint(-6, 6) for _ in range(n)] for _ in range(n)]
+        d = hill_nxn.det_bareiss(A)
+        assert d == round(np.linalg.det(np.array(A, dtype=float)))
+        if d != 0:
+            det, adj = hill_nxn.det_y_adjunta(A)
+            assert det == d
+            assert (np.array(A) @ np.array(adj) == d * np.eye(n, dtype=np.int64)).all()
+
+
+def test_lotes_nxn():
+    rng = random.Random(5)
+    for n, modulo in ((2, 29), (4, 29), (5, 31), (4, None)):
+        Ks = [hill_nxn.generar_llave(n, modulo, rng) for _ in range(20)]
+        textos = ["LA PRACTICA HACE AL MAESTRO."[:rng.randrange(5, 28)] for _ in Ks]
+        cifrados, _ = hill_nxn.cifrar_lote(Ks, textos, modulo)
+        for K, texto, c in zip(Ks, textos, cifrados.tolist()):
+            esperado = hill_nxn.cifrar(K, texto, modulo)
+            assert c[:len(esperado)] == esperado
+        planos = hill_nxn.descifrar_lote(Ks, cifrados, modulo)
+        for texto, p in zip(textos, planos.tolist()):
+            assert hill_nxn.CODEC.decodificar(p)[:len(texto)] == texto
+
+
+def test_enumeracion_del_catalogo():
+    cota = 1
+    columnas = catalogo.enumerar(cota, trabajos=1)
+    valores = range(-cota, cota + 1)
+    esperadas = [M for M in (np.reshape(x, (3, 3)).tolist() for x in itertools.product(valores, repeat=9))
+                 if abs(enteros.det3(M)) == 1]
+    encontradas = catalogo.decodificar(columnas["codigos"], cota).tolist()
+    assert sorted(encontradas) == sorted(esperadas)
+    for M, inv_max, signo in zip(encontradas, columnas["inversa_max"].tolist(), columnas["signo"].tolist()):
+        assert signo == enteros.det3(M)
+        assert inv_max == max(abs(x) for fila in enteros.inv_unimodular(M) for x in fila)
+
+
+def test_longitud_corta_en_texts_to_array():
+    with pytest.raises(ValueError):
+        mod29.texts_to_array(["HOLA MUNDO", "AB"], length=6)
+    msgs, _ = mod29.texts_to_array(["HOLA", "AB"], length=7)
+    assert msgs.shape == (2, 9)
@@ -0,0 +1,25 @@
+# Una escritura interrumpida no debe dejar un .jsonl truncado con un .idx "válido".
+
+import pytest
+
+from paquetes_io import EXT_INDICE, escribir_jsonl, leer_indice
+
+
+def _paquetes_con_fallo():
+    yield {"id": 1, "K": [[1, 0, 0], [0, 1, 0], [0, 0, 1]]}
+    raise RuntimeError("falla a mitad de la generación")
+
+
+def test_escritura_interrumpida_no_deja_archivos(tmp_path):
+    ruta = tmp_path / "docente.jsonl"
+    escribir_jsonl(str(ruta), [{"id": 7}])
+    with pytest.raises(RuntimeError):
+        escribir_jsonl(str(ruta), _paquetes_con_fallo())
+    assert not ruta.exists()
+    assert not (tmp_path / ("docente.jsonl" + EXT_INDICE)).exists()
+
+
+def test_escritura_completa(tmp_path):
+    ruta = str(tmp_path / "docente.jsonl")
+    assert escribir_jsonl(ruta, [{"id": 1}, {"id": 2}]) == 2
+    assert sorted(leer_indice(ruta)) == [1, 2]
@@ -0,0 +1,33 @@
+# Cada alumno tiene su propio flujo aleatorio, así que el resultado no depende
+# del orden ni del número de procesos.
+
+import os
+
+import pytest
+
+import genera_paquetes
+from semillas import flujo_alumno, generador_alumno
+
+FRASES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      "frases", "frases_300_motivacionales_v3.txt")
+
+
+def test_flujos_independientes_del_orden():
+    adelante = [flujo_alumno(2025, i).random() for i in range(1, 6)]
+    atras = [flujo_alumno(2025, i).random() for i in range(5, 0, -1)][::-1]
+    assert adelante == atras
+    assert len(set(adelante)) == 5
+    assert flujo_alumno(2025, 1, intento=1).random() != adelante[0]
+    assert generador_alumno(2025, 3).integers(1 << 30) == generador_alumno(2025, 3).integers(1 << 30)
+
+
+@pytest.mark.parametrize("variante", sorted(genera_paquetes.VARIANTES))
+def test_paquetes_identicos_con_1_y_4_trabajos(tmp_path, variante):
+    salidas = {}
+    for trabajos in (1, 4):
+        docente = tmp_path / f"docente_{trabajos}.jsonl"
+        alumnos = tmp_path / f"alumnos_{trabajos}.jsonl"
+        genera_paquetes.main(trabajos=trabajos, variante=variante, ruta_frases=FRASES,
+                             salida_docente=str(docente), salida_alumnos=str(alumnos))
+        salidas[trabajos] = (docente.read_bytes(), alumnos.read_bytes())
+    assert salidas[1] == salidas[4]
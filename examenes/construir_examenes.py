@@ -0,0 +1,254 @@
+# ======================================================
+# Archivo: construir_examenes.py
+# Varias variantes de examen a partir de una plantilla: cada variante recibe
+# sus propios sistemas A·X = B con A entera de inversa entera
+# (Generador_Matrices) y produce un par de drivers sin/con soluciones, como
+# los del Makefile.
+#
+# Compilación compartida: el preámbulo de la plantilla se precompila UNA vez
+# en un formato (mylatexformat) que usan todos los drivers, y los latexmk se
+# reparten en un pool de procesos. Un manifiesto de hashes salta los drivers
+# cuyo contenido no cambió.
+#
+# Uso (desde examenes/): python construir_examenes.py [--variantes 40] [--sistemas 4]
+#                        [--plantilla examen_sistemas.tex] [--trabajos 4] [--sin-formato]
+# ======================================================
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from Generador_Matrices import generar_sistemas  # noqa: E402
+
+PLANTILLA = "examen_sistemas.tex"
+SALIDA = "build"
+FORMATO = "examen_preambulo"
+MARCA_VARIANTE = "%%VARIANTE%%"
+MARCA_SISTEMAS = "%%SISTEMAS%%"
+VARIANTES = 40
+SISTEMAS = 4
+SEMILLA = 2025
+MAX_X = 5                               # |x| <= MAX_X en las soluciones
+VERSIONES = {"sin": ("nosolucion", "Sin soluciones"), "con": ("solucion", "Con soluciones")}
+
+LATEXMK = ["latexmk", "-pdf", "-silent", "-interaction=nonstopmode"]
+MANIFIESTO = ".hashes_examenes.json"
+REPORTE = "reporte_examenes.json"
+VARIABLES = ("x", "y", "z")
+ESTILO = os.path.join(RAIZ, "macros_simple.sty")  # entra en el hash: cambiarlo recompila todo
+
+# ----------------------------------------
+# SISTEMAS POR VARIANTE
+# ----------------------------------------
+def sistemas_variantes(variantes, sistemas=SISTEMAS, semilla=SEMILLA):
+    """[[(A, A⁻¹, X, B), ...] por variante]; ninguna matriz A se repite en todo el lote.
+
+    Cada variante usa su propio generador (semilla, número de variante), así que
+    la variante k es la misma aunque cambie el total de variantes.
+    """
+    vistas = set()
+    lote = []
+    for v in range(1, variantes + 1):
+        rng = np.random.default_rng([semilla, v])
+        elegidos = []
+        while len(elegidos) < sistemas:
+            lote_v = generar_sistemas(sistemas - len(elegidos), max_x=MAX_X, rng=rng)
+            for A, A_inv, X, B in zip(lote_v["A"], lote_v["A_inv"], lote_v["X"], lote_v["B"]):
+                huella = A.tobytes()
+                if huella in vistas:
+                    continue
+                vistas.add(huella)
+                elegidos.append((A, A_inv, X, B))
+        lote.append(elegidos)
+    return lote
+
+# ----------------------------------------
+# LaTeX
+# ----------------------------------------
+def tex_ecuacion(fila, b):
+    terminos = []
+    for a, var in zip(fila, VARIABLES):
+        if a == 0:
+            continue
+        coef = var if abs(a) == 1 else f"{abs(a)}{var}"
+        if terminos:
+            terminos.append(f"{'-' if a < 0 else '+'} {coef}")
+        else:
+            terminos.append(f"{'-' if a < 0 else ''}{coef}")
+    return " ".join(terminos) + f" &= {b}"
+
+def tex_matriz(M):
+    return r"\begin{pmatrix}" + r" \\ ".join(" & ".join(str(x) for x in fila) for fila in M) + r"\end{pmatrix}"
+
+def tex_sistema(A, A_inv, X, B):
+    ecuaciones = r" \\ ".join(tex_ecuacion(fila, b) for fila, b in zip(A.tolist(), B.tolist()))
+    solucion = ", ".join(f"{v} = {x}" for v, x in zip(VARIABLES, X.tolist()))
+    return "\n".join([
+        r"\begin{ejercicio}",
+        r"Resuelva el sistema \[ \begin{aligned} " + ecuaciones + r" \end{aligned} \]",
+        r"\end{ejercicio}",
+        r"\muestraSolucion{$A^{-1} = " + tex_matriz(A_inv.tolist()) + r"$, \quad $" + solucion + "$}",
+        r"\vspace{1.5cm}",
+        "",
+    ])
+
+def llenar_plantilla(plantilla, v, sistemas):
+    cuerpo = "\n".join(tex_sistema(*s) for s in sistemas)
+    return plantilla.replace(MARCA_VARIANTE, f"{v:02d}").replace(MARCA_SISTEMAS, cuerpo)
+
+def driver(ruta_variante, version):
+    opcion, etiqueta = VERSIONES[version]
+    return "\n".join([
+        rf"\PassOptionsToPackage{{{opcion}}}{{macros_simple}}",
+        rf"\providecommand{{\versionEtiqueta}}{{{etiqueta}}}",
+        rf"\input{{{ruta_variante}}}",
+        "",
+    ])
+
+def hash_estilo(ruta=ESTILO):
+    if not os.path.exists(ruta):
+        return ""
+    with open(ruta, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def escribir_variantes(plantilla, lote, salida=SALIDA):
+    """Escribe examen_vNN.tex y sus drivers examen_vNN_sin/con.tex; devuelve [(driver, hash)]."""
+    os.makedirs(salida, exist_ok=True)
+    estilo = hash_estilo()
+    drivers = []
+    for v, sistemas in enumerate(lote, start=1):
+        cuerpo = llenar_plantilla(plantilla, v, sistemas)
+        ruta_variante = os.path.join(salida, f"examen_v{v:02d}.tex")
+        with open(ruta_variante, "w", encoding="utf-8") as f:
+            f.write(cuerpo)
+        for version in VERSIONES:
+            texto = driver(ruta_variante.replace(os.sep, "/"), version)
+            ruta = os.path.join(salida, f"examen_v{v:02d}_{version}.tex")
+            with open(ruta, "w", encoding="utf-8") as f:
+                f.write(texto)
+            drivers.append((ruta, hashlib.sha256((texto + cuerpo + estilo).encode("utf-8")).hexdigest()))
+    return drivers
+
+# ----------------------------------------
+# COMPILACIÓN COMPARTIDA
+# ----------------------------------------
+def entorno_tex():
+    """Como el Makefile: LaTeX busca también en la carpeta padre (macros_simple.sty)."""
+    return {**os.environ, "TEXINPUTS": ".:..:" + os.environ.get("TEXINPUTS", "")}
+
+def generar_formato(ruta_plantilla, salida=SALIDA):
+    """Precompila el preámbulo común (lo anterior a \\endofdump) si la plantilla o el estilo cambiaron.
+
+    Devuelve None si no se pudo (pdflatex ausente o error); entonces se compila sin formato.
+    """
+    ruta_fmt = os.path.join(salida, FORMATO + ".fmt")
+    fuentes = [r for r in (ruta_plantilla, ESTILO) if os.path.exists(r)]
+    if not os.path.exists(ruta_fmt) or any(os.path.getmtime(ruta_fmt) < os.path.getmtime(r) for r in fuentes):
+        try:
+            subprocess.run(
+                ["pdflatex", "-ini", "-interaction=nonstopmode", f"-jobname={FORMATO}",
+                 f"-output-directory={salida}", "&pdflatex", "mylatexformat.ltx", ruta_plantilla],
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=True, env=entorno_tex(),
+            )
+        except FileNotFoundError:
+            print("⚠️ pdflatex no está instalado; se compila sin formato.")
+            return None
+        except subprocess.CalledProcessError as e:
+            print(f"⚠️ No se pudo precompilar el preámbulo (código {e.returncode}); se compila sin formato.")
+            return None
+    return os.path.abspath(os.path.splitext(ruta_fmt)[0])
+
+def compilar_driver(ruta, comando):
+    salida = os.path.dirname(ruta) or "."
+    inicio = time.perf_counter()
+    try:
+        codigo = subprocess.run(comando + [f"-outdir={salida}", ruta], stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, env=entorno_tex()).returncode
+    except FileNotFoundError:
+        codigo = 127  # compilador no instalado
+    return {"tex": ruta, "ok": codigo == 0, "codigo": codigo,
+            "segundos": round(time.perf_counter() - inicio, 3)}
+
+def _leer_manifiesto(salida):
+    ruta = os.path.join(salida, MANIFIESTO)
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def compilar_drivers(drivers, comando, trabajos=None, forzar=False, salida=SALIDA):
+    """Compila en un pool los drivers cuyo contenido cambió (o sin PDF)."""
+    manifiesto = {} if forzar else _leer_manifiesto(salida)
+    pendientes = [(r, h) for r, h in drivers
+                  if manifiesto.get(os.path.basename(r)) != h or not os.path.exists(r[:-4] + ".pdf")]
+    reporte = {"compilados": [], "omitidos": len(drivers) - len(pendientes), "fallidos": []}
+    if pendientes:
+        rutas = [r for r, _ in pendientes]
+        with ProcessPoolExecutor(max_workers=trabajos or os.cpu_count() or 1) as pool:
+            for (ruta, h), res in zip(pendientes, pool.map(compilar_driver, rutas, [comando] * len(rutas))):
+                if res["ok"]:
+                    manifiesto[os.path.basename(ruta)] = h
+                    reporte["compilados"].append(res)
+                else:
+                    manifiesto.pop(os.path.basename(ruta), None)
+                    reporte["fallidos"].append(res)
+        with open(os.path.join(salida, MANIFIESTO), "w", encoding="utf-8") as f:
+            json.dump(manifiesto, f, indent=0, sort_keys=True)
+    with open(os.path.join(salida, REPORTE), "w", encoding="utf-8") as f:
+        json.dump(reporte, f, ensure_ascii=False, indent=2)
+    return reporte
+
+# ----------------------------------------
+# PRINCIPAL
+# ----------------------------------------
+def construir(ruta_plantilla=PLANTILLA, variantes=VARIANTES, sistemas=SISTEMAS, semilla=SEMILLA,
+              salida=SALIDA, trabajos=None, usar_formato=True, compilar=True, forzar=False):
+    with open(ruta_plantilla, "r", encoding="utf-8") as f:
+        plantilla = f.read()
+    if MARCA_SISTEMAS not in plantilla:
+        raise ValueError(f"La plantilla {ruta_plantilla} no tiene la marca {MARCA_SISTEMAS}.")
+    drivers = escribir_variantes(plantilla, sistemas_variantes(variantes, sistemas, semilla), salida)
+    if not compilar:
+        return {"drivers": [r for r, _ in drivers]}
+    comando = LATEXMK
+    if usar_formato:
+        formato = generar_formato(ruta_plantilla, salida)
+        if formato:
+            comando = LATEXMK + [f"-pdflatex=pdflatex -fmt={formato} %O %S"]
+    return compilar_drivers(drivers, comando, trabajos, forzar, salida)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Construye variantes de examen (sin/con soluciones) en paralelo.")
+    parser.add_argument("--plantilla", default=PLANTILLA)
+    parser.add_argument("--variantes", type=int, default=VARIANTES)
+    parser.add_argument("--sistemas", type=int, default=SISTEMAS, help="sistemas 3x3 por variante")
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--salida", default=SALIDA)
+    parser.add_argument("--trabajos", type=int, default=None, help="latexmk simultáneos (por defecto, núcleos)")
+    parser.add_argument("--sin-formato", action="store_true", help="no precompilar el preámbulo común")
+    parser.add_argument("--solo-tex", action="store_true", help="escribir los .tex sin compilar")
+    parser.add_argument("--forzar", action="store_true", help="recompilar aunque nada haya cambiado")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    reporte = construir(args.plantilla, args.variantes, args.sistemas, args.semilla, args.salida,
+                        args.trabajos, not args.sin_formato, not args.solo_tex, args.forzar)
+    if args.solo_tex:
+        print(f"✅ {len(reporte['drivers'])} drivers en {args.salida}")
+    else:
+        print(f"✅ {len(reporte['compilados'])} compilados, {reporte['omitidos']} al día, "
+              f"{len(reporte['fallidos'])} fallidos en {time.perf_counter() - inicio:.1f} s")
+    return reporte
+
+
+if __name__ == "__main__":
+    main()